@@ -2,6 +2,8 @@
 Configurações da aplicação usando Pydantic
 """
 
+import json
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,7 +11,7 @@ class TrainerConfig(BaseSettings):
     """
     Configurações de treinamento
     """
-    
+
     gen_n_samples: int = 100
     gen_n_features: int = 3
     gen_noise: float = 0.1
@@ -17,22 +19,122 @@ class TrainerConfig(BaseSettings):
     test_size: float = 0.2
     optuna_n_trials: int = 100
 
+    # Otimização multiobjetivo: R² de validação, latência e tamanho do modelo
+    hpo_multi_objective: bool = False
+    hpo_validation_size: float = 0.2
+    hpo_latency_repeats: int = 5
+    hpo_latency_batch_size: int = 1000
+    max_single_latency_ms: float | None = None
+    max_batch_latency_ms: float | None = None
+    max_model_size_mb: float | None = None
+
+    # Destilação do modelo em um substituto compacto para servir
+    distill: bool = False
+    distill_estimator: str = "tree"  # "tree" ou "boosting"
+    distill_n_samples: int = 20000
+    distill_max_depth: int = 8
+    distill_n_estimators: int = 50
+    distill_include_train_data: bool = True
+    distill_min_fidelity_r2: float = 0.95
+
+    # Torneio entre estimadores candidatos (vazio: apenas Random Forest)
+    tournament_candidates: list[str] = []
+    tournament_n_workers: int | None = None
+
+    # Telemetria de recursos por etapa (run_report.json); o tracemalloc deixa
+    # lentas as alocações do Python, inclusive nos workers do torneio, e
+    # infla todos os tempos e latências medidos durante o treinamento
+    telemetry_trace_memory: bool = False
+
 
 class AppConfig(BaseSettings):
     """
     Configurações da aplicação
     """
-    
+
     model_date: str = "20250805"
     models_path: str = "src/models"
-    
+    model_name: str = "RandomForestRegressor"
+    serve_surrogate: bool = False
+    # Servidor de socket Unix no mesmo processo da API (desligado por padrão)
+    uds_enabled: bool = False
+    uds_socket_path: str = "/tmp/api-predicao-casas.sock"
+    max_batch_rows: int = 10000
+
+    # Registro de versões do modelo (carregadas sob demanda)
+    model_version_header: str = "X-Model-Version"
+    model_registry_budget_mb: float = 512.0
+
+    # Avaliação em sombra de um modelo candidato (desligada por padrão)
+    shadow_model_date: str | None = None
+    shadow_queue_rows: int = 10000
+    shadow_batch_size: int = 256
+
+    # Profiling sob demanda (desligado por padrão)
+    profiling_sample_rate: float = 0.0
+    profiling_admin_token: str | None = None
+    profiling_header: str = "X-Profile-Token"
+    profiling_max_fraction: float = 0.01
+    profiling_admin_per_minute: float = 6.0
+    profiling_dir: str = "logs/profiles"
+    profiling_max_files: int = 100
+    profiling_interval: float = 0.001
+
+    @property
+    def profiling_enabled(self) -> bool:
+        return self.profiling_sample_rate > 0 or bool(self.profiling_admin_token)
+
     @property
     def scaler_path(self) -> str:
-        return f"{self.models_path}/{self.model_date}/scaler.pkl"
-    
+        return self.scaler_path_for(self.model_date)
+
+    @property
+    def feature_stats_path(self) -> str:
+        return self.feature_stats_path_for(self.model_date)
+
     @property
     def model_path(self) -> str:
-        return f"{self.models_path}/{self.model_date}/RandomForestRegressor/model.pkl"
+        return self.model_path_for(self.model_date)
+
+    @property
+    def surrogate_model_path(self) -> str:
+        return self.surrogate_model_path_for(self.model_date)
+
+    @property
+    def serving_model_path(self) -> str:
+        return self.serving_model_path_for(self.model_date)
+
+    def scaler_path_for(self, model_date: str) -> str:
+        return f"{self.models_path}/{model_date}/scaler.pkl"
+
+    def feature_stats_path_for(self, model_date: str) -> str:
+        return f"{self.models_path}/{model_date}/feature_stats.json"
+
+    def manifest_path_for(self, model_date: str) -> str:
+        return f"{self.models_path}/{model_date}/manifest.json"
+
+    def model_name_for(self, model_date: str) -> str:
+        """
+        Pasta do modelo de uma versão: a registrada no manifesto salvo pelo
+        treinamento ou, em versões sem manifesto, `model_name`
+        """
+        try:
+            with open(self.manifest_path_for(model_date)) as f:
+                return json.load(f)["model_name"]
+        except (OSError, KeyError, ValueError):
+            return self.model_name
+
+    def model_path_for(self, model_date: str) -> str:
+        model_name = self.model_name_for(model_date)
+        return f"{self.models_path}/{model_date}/{model_name}/model.pkl"
+
+    def surrogate_model_path_for(self, model_date: str) -> str:
+        return f"{self.models_path}/{model_date}/surrogate/model.pkl"
+
+    def serving_model_path_for(self, model_date: str) -> str:
+        if self.serve_surrogate:
+            return self.surrogate_model_path_for(model_date)
+        return self.model_path_for(model_date)
 
 
 # Instâncias globais das configurações
@@ -1,7 +1,8 @@
 """
 Módulo de API - Rotas e modelos da aplicação
-"""
-
-from .routes import router
 
-__all__ = ["router"]
+As rotas não são importadas aqui: `src.api.models` e `src.api.validation`
+também são usados pelo treinamento, que não deve carregar o router (registro
+de versões, avaliação em sombra e profiler). Importe o router de
+`src.api.routes`.
+"""
@@ -29,6 +29,18 @@ class PredictionRequest(BaseModel):
     banheiros: int = Field(..., gt=0, le=10, description="Número de banheiros")
 
 
+class BatchPredictionResponse(BaseModel):
+    """
+    Modelo para resposta de predição em lote.
+
+    Args:
+        predictions: Previsões de valor das casas, na ordem do lote
+            (-1 para casas que violam as regras de negócio).
+    """
+
+    predictions: list[float]
+
+
 class PredictionResponse(BaseModel):
     """
     Modelo para resposta de predição.
@@ -9,13 +9,26 @@ nasser.boan@vert.com.br
 """
 
 import time
+from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Body, Header, HTTPException, Response
+from fastapi.exceptions import RequestValidationError
 
-from ..core.house_predictor import HousePredictorApp
-from .models import PredictionRequest, PredictionResponse
+from config.settings import app_config
+
+from ..core.monitoring import compare_with_training, load_training_stats, serving_stats
+from ..core.registry import (
+    ModelVersionNotFoundError,
+    get_house_predictor,
+    get_model_registry,
+)
+from ..core.shadow import get_shadow_scorer
+from ..utils.profiler import attach_current_thread
+from .models import BatchPredictionResponse, PredictionRequest, PredictionResponse
+from .validation import BulkValidator
 
 router = APIRouter()
+bulk_validator = BulkValidator(PredictionRequest, max_rows=app_config.max_batch_rows)
 
 
 @router.get("/health", tags=["health"])
@@ -39,8 +52,47 @@ def root():
     }
 
 
+def _get_predictor(version: str | None):
+    try:
+        return get_house_predictor(version)
+    except ModelVersionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+def _submit_shadow(predictor, features, predictions):
+    """
+    Envia as predições para a sombra, só quando servidas pela versão padrão:
+    versões fixadas pelo cliente misturariam outras referências na comparação
+    """
+    shadow_scorer = get_shadow_scorer()
+    if (
+        shadow_scorer
+        and predictor.model_date == get_model_registry().default_version
+        and predictor.model_date != shadow_scorer.candidate_version
+    ):
+        shadow_scorer.submit(features, predictions)
+
+
+def _predict(request: PredictionRequest, version: str | None, response: Response):
+    attach_current_thread()
+    predictor = _get_predictor(version)
+    prediction = predictor.predict(request)
+    _submit_shadow(
+        predictor,
+        ((request.quartos, request.tamanho, request.banheiros),),
+        (prediction,),
+    )
+
+    response.headers[app_config.model_version_header] = predictor.model_date
+    return PredictionResponse(prediction=prediction)
+
+
 @router.post("/predict", response_model=PredictionResponse)
-def predict(request: PredictionRequest) -> PredictionResponse:
+def predict(
+    request: PredictionRequest,
+    response: Response,
+    x_model_version: str | None = Header(default=None),
+) -> PredictionResponse:
     """
     Endpoint para predição.
 
@@ -48,9 +100,103 @@ def predict(request: PredictionRequest) -> PredictionResponse:
 
     Args:
         request: Dados da casa a ser predita.
+        x_model_version: Versão do modelo (opcional, cabeçalho `X-Model-Version`).
 
     """
-    predictor = HousePredictorApp()
-    prediction = predictor.predict(request)
+    return _predict(request, x_model_version, response)
+
+
+@router.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_batch(
+    response: Response,
+    payload: dict[str, Any] = Body(
+        ...,
+        examples=[{"quartos": [3, 2], "tamanho": [120.5, 80.0], "banheiros": [2, 1]}],
+    ),
+    x_model_version: str | None = Header(default=None),
+) -> BatchPredictionResponse:
+    """
+    Endpoint para predição em lote.
 
-    return PredictionResponse(prediction=prediction)
+    Recebe as casas em formato colunar (uma lista por campo) e retorna as
+    previsões na mesma ordem. A validação aplica as mesmas restrições de
+    `PredictionRequest`, de forma vetorizada; erros são devolvidos com
+    status 422, no formato do Pydantic, com o índice da casa no `loc`.
+
+    Args:
+        payload: Lista de valores de cada campo de `PredictionRequest`.
+        x_model_version: Versão do modelo (opcional, cabeçalho `X-Model-Version`).
+
+    """
+    attach_current_thread()
+    features, errors = bulk_validator.validate(payload)
+    if errors:
+        raise RequestValidationError(errors)
+
+    predictor = _get_predictor(x_model_version)
+    predictions = predictor.predict_batch(features)
+    _submit_shadow(predictor, features, predictions)
+
+    response.headers[app_config.model_version_header] = predictor.model_date
+    return BatchPredictionResponse(predictions=predictions.tolist())
+
+
+@router.post("/models/{version}/predict", response_model=PredictionResponse)
+def predict_version(
+    version: str, request: PredictionRequest, response: Response
+) -> PredictionResponse:
+    """
+    Endpoint para predição com uma versão específica do modelo.
+
+    Args:
+        version: Versão do modelo (pasta em `models_path`).
+        request: Dados da casa a ser predita.
+
+    """
+    return _predict(request, version, response)
+
+
+@router.get("/models", tags=["monitoring"])
+def models():
+    """
+    Versões do modelo disponíveis e residentes em memória.
+
+    Inclui, por versão, o número de cargas, acertos, despejos e o tamanho
+    ocupado.
+    """
+    registry = get_model_registry()
+    return {"available": registry.available_versions(), **registry.stats()}
+
+
+@router.get("/stats", tags=["monitoring"])
+def stats():
+    """
+    Estatísticas em streaming das entradas e predições servidas pela versão
+    padrão do modelo (versões fixadas pelo cliente não entram no resumo).
+
+    Inclui as estatísticas de treinamento do modelo em uso e, quando
+    disponíveis, o drift entre as duas.
+    """
+    summary = serving_stats.summary()
+    training = load_training_stats(app_config.feature_stats_path)
+
+    return {
+        "model_date": app_config.model_date,
+        "serving": summary,
+        "training": training,
+        "drift": compare_with_training(summary, training) if training else None,
+    }
+
+
+@router.get("/shadow", tags=["monitoring"])
+def shadow():
+    """
+    Concordância entre o modelo servido e o candidato avaliado em sombra.
+
+    Inclui a diferença absoluta média, quantis das diferenças e quantas
+    amostras foram descartadas por sobrecarga.
+    """
+    shadow_scorer = get_shadow_scorer()
+    if shadow_scorer is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow_scorer.report()}
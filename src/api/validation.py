@@ -0,0 +1,344 @@
+"""
+Validação vetorizada de lotes de predição
+
+Os limites (`gt`, `ge`, `lt`, `le`) e os tipos são lidos do schema de
+`PredictionRequest`, de modo que o lote e a requisição unitária nunca
+divergem. Em vez de criar um modelo Pydantic por casa, cada coluna é
+convertida em um array NumPy e verificada de uma vez; os erros seguem o
+formato dos erros do Pydantic (`type`, `loc`, `msg`, `input`, `ctx`).
+
+Só um subconjunto do schema é suportado (campos `int`/`float` obrigatórios,
+com limites `gt`/`ge`/`lt`/`le`); qualquer outra restrição, tipo ou
+validador no modelo faz `field_constraints` falhar, em vez de ser ignorado.
+"""
+
+import math
+import re
+
+import numpy as np
+from annotated_types import Ge, Gt, Le, Lt
+from pydantic import BaseModel
+
+from .models import PredictionRequest
+
+# Ordem em que o Pydantic verifica os limites: só o primeiro erro é reportado
+BOUNDS = (
+    (Le, "le", "less_than_equal", "less than or equal to", np.less_equal),
+    (Lt, "lt", "less_than", "less than", np.less),
+    (Ge, "ge", "greater_than_equal", "greater than or equal to", np.greater_equal),
+    (Gt, "gt", "greater_than", "greater than", np.greater),
+)
+
+
+class FieldConstraints:
+    """Tipo e limites de um campo de um modelo Pydantic"""
+
+    def __init__(self, name: str, is_int: bool, bounds: dict[str, float]):
+        """
+        Args:
+            name: Nome do campo
+            is_int: Se o campo é inteiro (senão, float)
+            bounds: Limites por chave (`gt`, `ge`, `lt`, `le`)
+        """
+        self.name = name
+        self.is_int = is_int
+        self.bounds = bounds
+
+    def domain(self) -> tuple[float, float]:
+        """Menor e maior valor aceitos (limites estritos viram o vizinho)"""
+        step = 1 if self.is_int else 1e-6
+        lower, upper = -math.inf, math.inf
+        if "gt" in self.bounds:
+            lower = self.bounds["gt"] + step
+        if "ge" in self.bounds:
+            lower = self.bounds["ge"]
+        if "lt" in self.bounds:
+            upper = self.bounds["lt"] - step
+        if "le" in self.bounds:
+            upper = self.bounds["le"]
+        return lower, upper
+
+
+def field_constraints(
+    model: type[BaseModel] = PredictionRequest,
+) -> dict[str, FieldConstraints]:
+    """
+    Tipo e limites de cada campo do modelo, na ordem do schema
+
+    Raises:
+        ValueError: Se o modelo usar algo que a validação em lote não
+            reproduz (outros tipos ou restrições, aliases, valores padrão,
+            validadores ou configuração estrita)
+    """
+    decorators = model.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+    ):
+        raise ValueError(f"{model.__name__}: validadores não são suportados")
+    if model.model_config.get("strict"):
+        raise ValueError(f"{model.__name__}: modo estrito não é suportado")
+
+    constraints = {}
+    for name, field in model.model_fields.items():
+        if field.annotation not in (int, float):
+            raise ValueError(
+                f"{model.__name__}.{name}: tipo {field.annotation!r} não suportado"
+            )
+        if not field.is_required() or field.alias:
+            raise ValueError(
+                f"{model.__name__}.{name}: campos opcionais ou com alias não "
+                "são suportados"
+            )
+        bounds = {}
+        for constraint in field.metadata:
+            for kind, key, *_ in BOUNDS:
+                if isinstance(constraint, kind):
+                    bounds[key] = getattr(constraint, key)
+                    break
+            else:
+                raise ValueError(
+                    f"{model.__name__}.{name}: restrição {constraint!r} não suportada"
+                )
+        constraints[name] = FieldConstraints(name, field.annotation is int, bounds)
+    return constraints
+
+
+# Erros de tipo do Pydantic por (campo inteiro, valor é texto)
+TYPE_ERRORS = {
+    (True, True): (
+        "int_parsing",
+        "Input should be a valid integer, unable to parse string as an integer",
+    ),
+    (True, False): ("int_type", "Input should be a valid integer"),
+    (False, True): (
+        "float_parsing",
+        "Input should be a valid number, unable to parse string as a number",
+    ),
+    (False, False): ("float_type", "Input should be a valid number"),
+}
+
+
+def _type_error(field: FieldConstraints, value, loc: tuple) -> dict:
+    """Erro de tipo no formato do Pydantic para um valor não numérico"""
+    kind, msg = TYPE_ERRORS[(field.is_int, isinstance(value, str))]
+    return {"type": kind, "loc": loc, "msg": msg, "input": value}
+
+
+# Inteiros em texto aceitos pelo Pydantic: sinal, `_` entre dígitos e parte
+# decimal só com zeros (ex.: "+1_000", "3.0")
+INT_STRING = re.compile(r"^[+-]?([0-9]+(?:_[0-9]+)*)(?:\.0+)?$")
+
+INT64_LIMIT = 2.0**63
+
+
+def _coerce(field: FieldConstraints, value) -> float | None:
+    """Conversão de um valor isolado, como no modo lax do Pydantic"""
+    if isinstance(value, bool | int | float):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    stripped = value.strip()
+    if field.is_int:
+        match = INT_STRING.match(stripped)
+        if match is None:
+            return None
+        number = float(match.group(1).replace("_", ""))
+        return -number if stripped.startswith("-") else number
+    # `float` aceita dígitos não ASCII, que o Pydantic recusa; o Pydantic só
+    # aceita `_` entre dígitos quando o texto não tem espaços nas pontas
+    if not stripped.isascii() or ("_" in value and stripped != value):
+        return None
+    try:
+        return float(stripped)
+    except ValueError:
+        return None
+
+
+class BulkValidator:
+    """Valida lotes colunares contra as restrições de um modelo Pydantic"""
+
+    def __init__(self, model: type[BaseModel] = PredictionRequest, max_rows=None):
+        """
+        Args:
+            model: Modelo cujo schema define as colunas e restrições
+            max_rows: Máximo de linhas por lote (opcional)
+        """
+        self.fields = field_constraints(model)
+        self.max_rows = max_rows
+
+    def _column(self, field: FieldConstraints, values, loc: tuple, errors: list):
+        """
+        Converte uma coluna em float64, registrando os erros de tipo
+
+        Returns:
+            Tuple com o array e a máscara das linhas com erro de tipo
+        """
+        try:
+            array = np.asarray(values)
+        except ValueError:  # listas irregulares
+            array = np.asarray(values, dtype=object)
+        if array.ndim == 1 and array.dtype.kind in "biuf":
+            array = array.astype(np.float64, copy=False)
+            invalid = np.zeros(len(array), dtype=bool)
+        else:
+            # Caminho lento, só para colunas com textos, nulos ou objetos
+            array = np.empty(len(values), dtype=np.float64)
+            invalid = np.zeros(len(values), dtype=bool)
+            for i, value in enumerate(values):
+                coerced = _coerce(field, value)
+                if coerced is None:
+                    invalid[i] = True
+                    errors.append(_type_error(field, value, (*loc, i)))
+                    array[i] = np.nan
+                else:
+                    array[i] = coerced
+
+        if field.is_int:
+            infinite = ~invalid & ~np.isfinite(array)
+            for i in np.flatnonzero(infinite):
+                errors.append(
+                    {
+                        "type": "finite_number",
+                        "loc": (*loc, int(i)),
+                        "msg": "Input should be a finite number",
+                        "input": values[i],
+                    }
+                )
+            invalid |= infinite
+            # Floats fora do intervalo de um inteiro de 64 bits são recusados
+            # pelo Pydantic; inteiros e textos grandes são aceitos
+            oversized = ~invalid & (np.abs(array) >= INT64_LIMIT)
+            for i in np.flatnonzero(oversized):
+                if isinstance(values[i], float):
+                    errors.append(
+                        {
+                            "type": "int_parsing_size",
+                            "loc": (*loc, int(i)),
+                            "msg": "Unable to parse input string as an integer, "
+                            "exceeded maximum size",
+                            "input": values[i],
+                        }
+                    )
+                    invalid[i] = True
+            fractional = ~invalid & (array != np.trunc(array))
+            for i in np.flatnonzero(fractional):
+                errors.append(
+                    {
+                        "type": "int_from_float",
+                        "loc": (*loc, int(i)),
+                        "msg": "Input should be a valid integer, got a number "
+                        "with a fractional part",
+                        "input": values[i],
+                    }
+                )
+            invalid |= fractional
+        return array, invalid
+
+    def _bounds(self, field: FieldConstraints, array, invalid, values, loc, errors):
+        """Verifica os limites do campo; só o primeiro erro de cada linha conta"""
+        reported = invalid.copy()
+        for _, key, kind, text, compare in BOUNDS:
+            if key not in field.bounds:
+                continue
+            bound = field.bounds[key] if field.is_int else float(field.bounds[key])
+            failed = ~reported & ~compare(array, bound)
+            for i in np.flatnonzero(failed):
+                errors.append(
+                    {
+                        "type": kind,
+                        "loc": (*loc, int(i)),
+                        "msg": f"Input should be {text} {field.bounds[key]}",
+                        "input": values[i],
+                        "ctx": {key: bound},
+                    }
+                )
+            reported |= failed
+        return reported
+
+    def validate(self, payload: dict, loc: tuple = ("body",)):
+        """
+        Valida um lote colunar `{campo: [valores]}`
+
+        Args:
+            payload: Dicionário com uma lista de valores por campo
+            loc: Prefixo do `loc` dos erros
+
+        Returns:
+            Tuple com a matriz de features (n_linhas, n_campos), na ordem do
+            schema, e a lista de erros; a matriz é None se houver erros
+        """
+        errors = []
+        columns = {}
+        for name in self.fields:
+            if name not in payload:
+                errors.append(
+                    {
+                        "type": "missing",
+                        "loc": (*loc, name),
+                        "msg": "Field required",
+                        "input": payload,
+                    }
+                )
+            elif not isinstance(payload[name], list | tuple | np.ndarray):
+                errors.append(
+                    {
+                        "type": "list_type",
+                        "loc": (*loc, name),
+                        "msg": "Input should be a valid list",
+                        "input": payload[name],
+                    }
+                )
+            else:
+                columns[name] = payload[name]
+        if errors:
+            return None, errors
+
+        lengths = {len(values) for values in columns.values()}
+        n_rows = max(lengths)
+        if len(lengths) > 1:
+            for name, values in columns.items():
+                if len(values) != n_rows:
+                    errors.append(
+                        {
+                            "type": "value_error",
+                            "loc": (*loc, name),
+                            "msg": "Value error, all columns must have the same "
+                            f"number of rows ({n_rows}), got {len(values)}",
+                            "input": None,
+                        }
+                    )
+            return None, errors
+        if self.max_rows is not None and n_rows > self.max_rows:
+            return None, [
+                {
+                    "type": "too_long",
+                    "loc": (*loc, name),
+                    "msg": f"List should have at most {self.max_rows} items "
+                    f"after validation, not {n_rows}",
+                    "input": None,
+                    "ctx": {
+                        "field_type": "List",
+                        "max_length": self.max_rows,
+                        "actual_length": n_rows,
+                    },
+                }
+                for name in columns
+            ]
+
+        features = np.empty((n_rows, len(self.fields)), dtype=np.float64)
+        for j, (name, field) in enumerate(self.fields.items()):
+            values = columns[name]
+            column_loc = (*loc, name)
+            array, invalid = self._column(field, values, column_loc, errors)
+            self._bounds(field, array, invalid, values, column_loc, errors)
+            features[:, j] = array
+
+        if errors:
+            # Erros na ordem do Pydantic: por campo e, dentro dele, por linha
+            order = list(self.fields)
+            errors.sort(key=lambda e: (order.index(e["loc"][len(loc)]), e["loc"][-1]))
+            return None, errors
+        return features, []
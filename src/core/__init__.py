@@ -3,5 +3,17 @@ Módulo Core - Lógica de negócio da aplicação
 """
 
 from .house_predictor import HousePredictorApp
+from .registry import (
+    ModelRegistry,
+    ModelVersionNotFoundError,
+    get_house_predictor,
+    get_model_registry,
+)
 
-__all__ = ["HousePredictorApp"]
+__all__ = [
+    "HousePredictorApp",
+    "ModelRegistry",
+    "ModelVersionNotFoundError",
+    "get_house_predictor",
+    "get_model_registry",
+]
@@ -3,11 +3,21 @@ Módulo de lógica de negócio
 """
 
 from .business_logic import BusinessRuleStrategy, HouseBusinessLogic
-from .rules import BanheirosRule, QuartosRule, TamanhoRule
+from .compiled import CompiledRuleSet
+from .rules import (
+    BanheirosRule,
+    PredicateRule,
+    QuartosRule,
+    TamanhoRule,
+    ThresholdRule,
+)
 
 __all__ = [
     "HouseBusinessLogic",
     "BusinessRuleStrategy",
+    "CompiledRuleSet",
+    "ThresholdRule",
+    "PredicateRule",
     "QuartosRule",
     "TamanhoRule",
     "BanheirosRule",
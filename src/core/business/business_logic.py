@@ -9,6 +9,7 @@ nasser.boan@vert.com.br
 
 from pydantic import BaseModel
 
+from .compiled import CompiledRuleSet
 from .rules import BusinessRuleStrategy
 
 
@@ -43,3 +44,10 @@ class HouseBusinessLogic:
             results.append(result)
 
         return results
+
+    def compile(self, feature_names: list[str]) -> CompiledRuleSet:
+        """
+        Compila as regras para avaliação vetorizada sobre uma matriz de
+        features com as colunas de `feature_names`
+        """
+        return CompiledRuleSet(self.rules, feature_names)
@@ -0,0 +1,120 @@
+"""
+Conjunto de regras de negócio compilado para avaliação vetorizada
+
+As regras são declaradas uma única vez e compiladas em arrays NumPy: todas
+as regras de limiar com o mesmo operador são avaliadas em uma única
+comparação sobre a matriz de features do lote. Para uma única requisição, as
+mesmas regras são compiladas em uma tupla de comparações escalares, que evita
+o custo fixo de montar e comparar arrays.
+"""
+
+import numpy as np
+from pydantic import BaseModel
+
+from .rules import OPERATORS, BusinessRuleStrategy, PredicateRule, ThresholdRule
+
+MAX_RULES = 64
+
+
+class CompiledRuleSet:
+    """
+    Regras de negócio compiladas sobre uma matriz de features
+
+    Cada regra ocupa um bit da máscara de violações (na ordem em que foi
+    declarada); uma linha é aceita quando sua máscara é 0.
+    """
+
+    def __init__(self, rules: list[BusinessRuleStrategy], feature_names: list[str]):
+        """
+        Args:
+            rules: Regras de limiar (`ThresholdRule`) ou predicados
+                (`PredicateRule`)
+            feature_names: Nome de cada coluna da matriz de features
+        """
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"No máximo {MAX_RULES} regras por conjunto")
+
+        self.feature_names = list(feature_names)
+        self.rule_names = [rule.name for rule in rules]
+        columns = {name: i for i, name in enumerate(self.feature_names)}
+
+        groups = {}
+        self._predicates = []
+        scalar_checks = []
+        scalar_predicates = []
+        for bit, rule in enumerate(rules):
+            if isinstance(rule, ThresholdRule):
+                scalar_checks.append(
+                    (rule.field, OPERATORS[rule.operator], rule.threshold)
+                )
+                group = groups.setdefault(rule.operator, ([], [], []))
+                group[0].append(columns[rule.field])
+                group[1].append(rule.threshold)
+                group[2].append(np.uint64(1) << np.uint64(bit))
+            elif isinstance(rule, PredicateRule):
+                self._predicates.append(
+                    (rule.predicate, np.uint64(1) << np.uint64(bit))
+                )
+                scalar_predicates.append(rule)
+            else:
+                raise TypeError(
+                    f"Regra {rule.__class__.__name__} não pode ser compilada: "
+                    "use ThresholdRule ou PredicateRule"
+                )
+
+        self._groups = [
+            (
+                OPERATORS[op],
+                np.asarray(cols, dtype=np.intp),
+                np.asarray(thresholds, dtype=np.float64),
+                np.asarray(bits, dtype=np.uint64),
+            )
+            for op, (cols, thresholds, bits) in groups.items()
+        ]
+        self._scalar_checks = tuple(scalar_checks)
+        self._scalar_predicates = tuple(scalar_predicates)
+
+    def violations(self, features: np.ndarray) -> np.ndarray:
+        """
+        Máscara de bits das regras violadas por linha
+
+        Args:
+            features: Matriz (n_linhas, n_features) na ordem de `feature_names`
+
+        Returns:
+            Array uint64 com um bit ligado para cada regra violada
+        """
+        mask = np.zeros(len(features), dtype=np.uint64)
+        for compare, cols, thresholds, bits in self._groups:
+            hits = compare(features[:, cols], thresholds)
+            mask |= (hits * bits).sum(axis=1, dtype=np.uint64)
+
+        if self._predicates:
+            columns = dict(zip(self.feature_names, features.T, strict=True))
+            for predicate, bit in self._predicates:
+                mask |= np.where(predicate(columns), bit, np.uint64(0))
+
+        return mask
+
+    def allowed(self, features: np.ndarray) -> np.ndarray:
+        """Array booleano com True nas linhas que não violam nenhuma regra"""
+        return self.violations(features) == 0
+
+    def accepts(self, data: BaseModel) -> bool:
+        """
+        Se uma única requisição não viola nenhuma regra, com comparações
+        escalares sobre os campos dela
+        """
+        for field, compare, threshold in self._scalar_checks:
+            if compare(getattr(data, field), threshold):
+                return False
+        for rule in self._scalar_predicates:
+            if rule.apply(data):
+                return False
+        return True
+
+    def describe(self, mask: int) -> list[str]:
+        """Nomes das regras ligadas em uma máscara de violações"""
+        return [
+            name for bit, name in enumerate(self.rule_names) if int(mask) >> bit & 1
+        ]
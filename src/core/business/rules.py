@@ -2,16 +2,30 @@
 Definição de regras de negócio para predição de casas
 """
 
+import operator
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 
+import numpy as np
 from pydantic import BaseModel
 
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
 
 class BusinessRuleStrategy(ABC):
     """
     Strategy pattern para aplicar regras de negócio.
     """
 
+    name: str = ""
+
     @abstractmethod
     def apply(self, data: BaseModel) -> bool:
         """
@@ -19,49 +33,89 @@ class BusinessRuleStrategy(ABC):
         """
 
 
-class QuartosRule(BusinessRuleStrategy):
+class ThresholdRule(BusinessRuleStrategy):
     """
-    Regra de negócio da quantidade de quartos.
-    Se a quantidade de quartos for maior que 5, retorna True
+    Regra de limiar: é violada (retorna True) quando `campo <operador> limiar`.
+
+    Regras de limiar são compiladas em comparações vetorizadas por
+    `CompiledRuleSet`.
     """
 
+    field: str
+    threshold: float
+    operator: str = ">"
+
+    def __init__(
+        self,
+        field: str | None = None,
+        threshold: float | None = None,
+        operator: str | None = None,
+    ):
+        if field is not None:
+            self.field = field
+        if threshold is not None:
+            self.threshold = threshold
+        if operator is not None:
+            self.operator = operator
+        if self.operator not in OPERATORS:
+            raise ValueError(f"Operador não suportado: {self.operator}")
+        self.name = self.name or f"{self.field} {self.operator} {self.threshold}"
+
     def apply(self, data: BaseModel) -> bool:
         """
         Aplica a regra de negócio.
         """
+        return OPERATORS[self.operator](getattr(data, self.field), self.threshold)
 
-        if data.quartos > 5:
-            return True
-        return False
 
-
-class TamanhoRule(BusinessRuleStrategy):
+class PredicateRule(BusinessRuleStrategy):
     """
-    Regra de negócio do tamanho da casa.
-    Se o tamanho da casa for maior que 200, retorna True
+    Regra definida por um predicado vetorizado.
+
+    O predicado recebe um dicionário `{feature: array}` com as colunas do lote
+    e retorna um array booleano, True nas linhas que violam a regra.
     """
 
+    def __init__(self, name: str, predicate: Callable[[dict], np.ndarray]):
+        self.name = name
+        self.predicate = predicate
+
     def apply(self, data: BaseModel) -> bool:
         """
         Aplica a regra de negócio.
         """
+        columns = {key: np.asarray([value]) for key, value in data.model_dump().items()}
+        return bool(self.predicate(columns)[0])
 
-        if data.tamanho > 200:
-            return True
-        return False
 
+class QuartosRule(ThresholdRule):
+    """
+    Regra de negócio da quantidade de quartos.
+    Se a quantidade de quartos for maior que 5, retorna True
+    """
 
-class BanheirosRule(BusinessRuleStrategy):
+    name = "QuartosRule"
+    field = "quartos"
+    threshold = 5
+
+
+class TamanhoRule(ThresholdRule):
+    """
+    Regra de negócio do tamanho da casa.
+    Se o tamanho da casa for maior que 200, retorna True
+    """
+
+    name = "TamanhoRule"
+    field = "tamanho"
+    threshold = 200
+
+
+class BanheirosRule(ThresholdRule):
     """
     Regra de negócio da quantidade de banheiros.
     Se a quantidade de banheiros for maior que 4, retorna True
     """
 
-    def apply(self, data: BaseModel) -> bool:
-        """
-        Aplica a regra de negócio.
-        """
-
-        if data.banheiros > 4:
-            return True
-        return False
+    name = "BanheirosRule"
+    field = "banheiros"
+    threshold = 4
@@ -2,34 +2,61 @@
 Serviço de predição de casas
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
 from loguru import logger
 
 from config.settings import app_config
 
-from ..api.models import PredictionRequest
 from ..utils import pydantic_model_to_dataframe
 from .business import HouseBusinessLogic, QuartosRule, TamanhoRule
 from .ml_model import HousePreProcessor, HouseRegressor
+from .monitoring import serving_stats
+
+if TYPE_CHECKING:
+    # Import apenas para tipagem: src.api importa este módulo nas rotas
+    from ..api.models import PredictionRequest
+
+FEATURES = ["quartos", "tamanho", "banheiros"]
 
 
 class HousePredictorApp:
-    def __init__(self, preprocessor=None, regressor=None):
-        """Inicializa a aplicação de predição"""
+    def __init__(self, preprocessor=None, regressor=None, model_date=None):
+        """
+        Inicializa a aplicação de predição
 
-        logger.info("Inicializando HousePredictorApp")
+        Args:
+            preprocessor: Pré-processador (opcional)
+            regressor: Regressor (opcional)
+            model_date: Versão dos artefatos em `models_path` (por padrão,
+                `app_config.model_date`)
+        """
+
+        self.model_date = model_date or app_config.model_date
+        # As estatísticas servidas são comparadas com as de treinamento da
+        # versão padrão; versões fixadas pelo cliente não entram nelas
+        self.records_serving_stats = self.model_date == app_config.model_date
+        logger.info(f"Inicializando HousePredictorApp (modelo {self.model_date})")
         self.house_logic = HouseBusinessLogic()
+        self.house_logic.add_rule(QuartosRule()).add_rule(TamanhoRule())
+        self.rule_set = self.house_logic.compile(FEATURES)
 
         self.preprocessor = preprocessor or HousePreProcessor(
-            scaler_path=app_config.scaler_path
+            scaler_path=app_config.scaler_path_for(self.model_date)
+        )
+        self.regressor = regressor or HouseRegressor(
+            model_path=app_config.serving_model_path_for(self.model_date)
         )
-        self.regressor = regressor or HouseRegressor(model_path=app_config.model_path)
 
     def _apply_business_rules(self, data: PredictionRequest) -> bool:
         """Aplica as regras de negócio"""
         logger.info("Aplicando regras de negócio")
-        self.house_logic.add_rule(QuartosRule()).add_rule(TamanhoRule())
-        business_rules = self.house_logic.apply_rules(data)
-        return not any(business_rules)  # Retorna True se nenhuma regra foi violada
+        # Retorna True se nenhuma regra foi violada
+        return self.rule_set.accepts(data)
 
     def _preprocess_data(self, data: PredictionRequest):
         """Pré-processa os dados"""
@@ -50,12 +77,54 @@ class HousePredictorApp:
         # 1. Aplicação das regras de negócio
         if not self._apply_business_rules(data):
             logger.error("Regras de negócio violadas")
+            if self.records_serving_stats:
+                serving_stats.observe(data.quartos, data.tamanho, data.banheiros, None)
             return -1
 
         # 2. Pré-processamento
         processed_data = self._preprocess_data(data)
 
         # 3. Predição
-        prediction = self._make_prediction(processed_data)
+        prediction = float(self._make_prediction(processed_data)[0])
+
+        # 4. Estatísticas de monitoramento
+        if self.records_serving_stats:
+            serving_stats.observe(
+                data.quartos, data.tamanho, data.banheiros, prediction
+            )
 
         return prediction
+
+    def predict_batch(
+        self, features: np.ndarray, record_stats: bool = True
+    ) -> np.ndarray:
+        """
+        Faz o fluxo completo para um lote de casas
+
+        As regras de negócio são avaliadas de forma vetorizada sobre o lote
+        e as casas aceitas são pré-processadas e preditas em uma única
+        chamada ao scaler e ao modelo. As que violam alguma regra recebem -1,
+        como em `predict`.
+
+        Args:
+            features: Matriz (n_casas, 3) com as colunas de `FEATURES`
+            record_stats: Se False, não registra o lote nas estatísticas de
+                monitoramento (ex.: predições em sombra); lotes de versões
+                que não são a padrão nunca são registrados
+        """
+        logger.info(f"Aplicando regras de negócio a um lote de {len(features)} casas")
+        allowed = self.rule_set.allowed(features)
+        predictions = np.full(len(features), -1.0)
+
+        if allowed.any():
+            logger.info(f"Predizendo lote de {int(allowed.sum())} casas")
+            processed_data = self.preprocessor.preprocess(
+                pd.DataFrame(features[allowed], columns=FEATURES)
+            )
+            predictions[allowed] = self._make_prediction(processed_data)
+
+        if not (record_stats and self.records_serving_stats):
+            return predictions
+
+        serving_stats.observe_batch(features, predictions, allowed)
+        return predictions
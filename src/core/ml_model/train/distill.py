@@ -0,0 +1,158 @@
+"""
+Módulo de destilação do modelo.
+
+Ele é responsável por:
+- Gerar amostras sintéticas densas no domínio válido de `PredictionRequest`
+- Rotular as amostras com as predições do modelo treinado (professor)
+- Ajustar um substituto compacto (árvore rasa ou boosting pequeno)
+- Medir a fidelidade ao professor (nas amostras sintéticas e no conjunto de
+  teste), o R² no conjunto de teste e os ganhos de latência e memória
+- Aceitar o substituto só se ele for fiel no conjunto de teste, menor e mais
+  rápido que o professor
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.tree import DecisionTreeRegressor
+
+from config.settings import trainer_config
+
+from ....api.validation import field_constraints
+from .hpo import measure_latency_ms
+
+
+class ModelDistiller:
+    """Classe para destilação do modelo em um substituto compacto"""
+
+    def __init__(
+        self, teacher, scaler, train_data: tuple, test_data: tuple, config=None
+    ):
+        """
+        Args:
+            teacher: Modelo treinado a ser destilado
+            scaler: Scaler ajustado no pré-processamento
+            train_data: Tuple com os dados de treinamento (normalizados)
+            test_data: Tuple com os dados de teste (normalizados)
+            config: Configurações do treinamento (opcional)
+        """
+        self.teacher = teacher
+        self.scaler = scaler
+        self.train_data = train_data
+        self.test_data = test_data
+        self.config = config or trainer_config
+        self.rng = np.random.default_rng(self.config.random_state)
+
+    def _sample_domain(self) -> np.ndarray:
+        """
+        Gera amostras uniformes no domínio válido das requisições, já
+        normalizadas pelo scaler
+        """
+        columns = {}
+        for name, field in field_constraints().items():
+            lower, upper = field.domain()
+            if field.is_int:
+                columns[name] = self.rng.integers(
+                    lower, upper, size=self.config.distill_n_samples, endpoint=True
+                )
+            else:
+                columns[name] = self.rng.uniform(
+                    lower, upper, size=self.config.distill_n_samples
+                )
+        return self.scaler.transform(pd.DataFrame(columns))
+
+    def _build_student(self):
+        if self.config.distill_estimator == "boosting":
+            return GradientBoostingRegressor(
+                n_estimators=self.config.distill_n_estimators,
+                max_depth=self.config.distill_max_depth,
+                random_state=self.config.random_state,
+            )
+        return DecisionTreeRegressor(
+            max_depth=self.config.distill_max_depth,
+            random_state=self.config.random_state,
+        )
+
+    def _measure(self, model, x) -> dict:
+        batch = np.resize(x, (self.config.hpo_latency_batch_size, x.shape[1]))
+        return {
+            "single_latency_ms": measure_latency_ms(
+                model, x[:1], self.config.hpo_latency_repeats
+            ),
+            "batch_latency_ms": measure_latency_ms(
+                model, batch, self.config.hpo_latency_repeats
+            ),
+            "model_size_mb": len(pickle.dumps(model)) / 1e6,
+        }
+
+    def _rejection_reasons(self, report: dict) -> list[str]:
+        """Motivos para não servir o substituto (vazio se ele for aceito)"""
+        reasons = []
+        if report["test_fidelity_r2"] < self.config.distill_min_fidelity_r2:
+            reasons.append(
+                f"fidelidade no teste {report['test_fidelity_r2']:.4f} abaixo de "
+                f"{self.config.distill_min_fidelity_r2}"
+            )
+        if report["size_ratio"] <= 1:
+            reasons.append("substituto não é menor que o modelo original")
+        if report["speedup_single"] <= 1:
+            reasons.append("substituto não é mais rápido que o modelo original")
+        return reasons
+
+    def run(self):
+        """
+        Executa a destilação
+
+        Returns:
+            Tuple com o substituto ajustado e o relatório da destilação; o
+            relatório traz `accepted` e, se False, `rejection_reasons`
+        """
+        x = self._sample_domain()
+        if self.config.distill_include_train_data:
+            x = np.vstack([x, np.asarray(self.train_data[0])])
+        y = self.teacher.predict(x)
+
+        x_fit, x_holdout, y_fit, y_holdout = train_test_split(
+            x, y, test_size=0.2, random_state=self.config.random_state
+        )
+        student = self._build_student()
+        student.fit(x_fit, y_fit)
+
+        x_test, y_test = self.test_data
+        x_test = np.asarray(x_test)
+        teacher_test = self.teacher.predict(x_test)
+        student_test = student.predict(x_test)
+        student_holdout = student.predict(x_holdout)
+        teacher_cost = self._measure(self.teacher, x_holdout)
+        student_cost = self._measure(student, x_holdout)
+
+        report = {
+            "estimator": student.__class__.__name__,
+            "n_samples": len(x),
+            "fidelity_r2": r2_score(y_holdout, student_holdout),
+            "fidelity_mae": mean_absolute_error(y_holdout, student_holdout),
+            # As amostras sintéticas cobrem todo o domínio válido, em geral
+            # muito além dos dados reais; a fidelidade no teste é a que conta
+            "test_fidelity_r2": r2_score(teacher_test, student_test),
+            "test_fidelity_mae": mean_absolute_error(teacher_test, student_test),
+            "teacher_test_r2": r2_score(y_test, teacher_test),
+            "student_test_r2": r2_score(y_test, student_test),
+            "teacher": teacher_cost,
+            "student": student_cost,
+            "speedup_single": teacher_cost["single_latency_ms"]
+            / student_cost["single_latency_ms"],
+            "speedup_batch": teacher_cost["batch_latency_ms"]
+            / student_cost["batch_latency_ms"],
+            "size_ratio": teacher_cost["model_size_mb"] / student_cost["model_size_mb"],
+        }
+        reasons = self._rejection_reasons(report)
+        report["accepted"] = not reasons
+        report["rejection_reasons"] = reasons
+        logger.info(f"Destilação concluída: {report}")
+
+        return student, report
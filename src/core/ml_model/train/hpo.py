@@ -4,6 +4,8 @@ Módulo de otimização de hiperparâmetros.
 Ele é responsável por:
 - Otimizar os hiperparâmetros do modelo
 - Recriar o modelo com os melhores hiperparâmetros
+- Opcionalmente, buscar a fronteira de Pareto entre R² de validação,
+  latência de inferência e tamanho serializado do modelo
 
 Versão: 1.0.0
 Data: 06/08/2025
@@ -11,39 +13,121 @@ Autor: Nasser Boan
 nasser.boan@vert.com.br
 """
 
+import pickle
+import time
+
+import numpy as np
 import optuna
 from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
 
 from config.settings import TrainerConfig
 
+SEARCH_SPACE = ("n_estimators", "max_depth", "min_samples_leaf")
+OBJECTIVES = ("val_r2", "single_latency_ms", "batch_latency_ms", "model_size_mb")
+
+
+def measure_latency_ms(model, x, repeats: int) -> float:
+    """
+    Mediana da latência de predição, em milissegundos
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(x)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def measure_serving_cost(model, x, config: TrainerConfig) -> dict:
+    """
+    Custos de servir o modelo, nas unidades dos orçamentos do `TrainerConfig`
+
+    Returns:
+        Dict com a latência de uma linha e de um lote de
+        `hpo_latency_batch_size` linhas (ms) e o tamanho serializado (MB)
+    """
+    x = np.asarray(x)
+    batch = np.resize(x, (config.hpo_latency_batch_size, x.shape[1]))
+    return {
+        "single_latency_ms": measure_latency_ms(
+            model, x[:1], config.hpo_latency_repeats
+        ),
+        "batch_latency_ms": measure_latency_ms(
+            model, batch, config.hpo_latency_repeats
+        ),
+        "model_size_mb": len(pickle.dumps(model)) / 1e6,
+    }
+
 
 class ModelHPO:
     def __init__(self, model, train_data: tuple, config: TrainerConfig):
         self.model = model
         self.train_data = train_data
         self.config = config
+        self.study = None
 
-    def objective(self, trial, model, train_data: tuple):
+    @staticmethod
+    def supports(model) -> bool:
         """
-        Função objetivo para a otimização de hiperparâmetros
+        Indica se o espaço de busca se aplica ao modelo (ensembles de árvores
+        com os parâmetros de `SEARCH_SPACE`)
         """
-        x_train, y_train = train_data
-        params = {
+        return set(SEARCH_SPACE) <= set(model.get_params())
+
+    def _suggest_params(self, trial) -> dict:
+        """
+        Espaço de busca dos hiperparâmetros
+        """
+        return {
             "n_estimators": trial.suggest_int("n_estimators", 100, 1000, step=100),
             "max_depth": trial.suggest_int("max_depth", 1, 50),
             "min_samples_leaf": trial.suggest_float("min_samples_leaf", 0.01, 0.5),
         }
 
+    def objective(self, trial, model, train_data: tuple):
+        """
+        Função objetivo para a otimização de hiperparâmetros
+        """
+        x_train, y_train = train_data
+        params = self._suggest_params(trial)
+
         model.set_params(**params)
         model.fit(x_train, y_train)
         return r2_score(y_train, model.predict(x_train))
 
+    def multi_objective(self, trial, model, fit_data: tuple, validation_data: tuple):
+        """
+        Função objetivo multiobjetivo
+
+        Returns:
+            Tuple com R² de validação, latência de uma linha (ms), latência
+            de um lote (ms) e tamanho serializado do modelo (MB)
+        """
+        x_fit, y_fit = fit_data
+        x_val, y_val = validation_data
+        params = self._suggest_params(trial)
+
+        model.set_params(**params)
+        model.fit(x_fit, y_fit)
+
+        val_r2 = r2_score(y_val, model.predict(x_val))
+        cost = measure_serving_cost(model, x_val, self.config)
+
+        return (
+            val_r2,
+            cost["single_latency_ms"],
+            cost["batch_latency_ms"],
+            cost["model_size_mb"],
+        )
+
     def _optimize_model(self, model, train_data: tuple):
         """
         Otimiza os hiperparâmetros do modelo
         """
 
         study = optuna.create_study(direction="maximize")
+        self.study = study
         study.optimize(
             lambda trial: self.objective(trial, model, train_data),
             n_trials=self.config.optuna_n_trials,
@@ -52,13 +136,58 @@ class ModelHPO:
 
         return study.best_params
 
+    def search_pareto_front(self) -> list[dict]:
+        """
+        Busca a fronteira de Pareto entre os objetivos de `OBJECTIVES`
+
+        Uma parte dos dados de treinamento é separada para validação, de modo
+        que o R² não seja medido nos mesmos dados usados no ajuste.
+
+        Returns:
+            Lista de candidatos não dominados, com os hiperparâmetros e o
+            valor de cada objetivo
+        """
+        x_train, y_train = self.train_data
+        x_fit, x_val, y_fit, y_val = train_test_split(
+            x_train,
+            y_train,
+            test_size=self.config.hpo_validation_size,
+            random_state=self.config.random_state,
+        )
+        x_val = np.asarray(x_val)
+
+        study = optuna.create_study(
+            directions=["maximize", "minimize", "minimize", "minimize"]
+        )
+        self.study = study
+        study.optimize(
+            lambda trial: self.multi_objective(
+                trial, self.model, (x_fit, y_fit), (x_val, y_val)
+            ),
+            n_trials=self.config.optuna_n_trials,
+            show_progress_bar=True,
+        )
+
+        return [
+            {"params": trial.params, **dict(zip(OBJECTIVES, trial.values, strict=True))}
+            for trial in study.best_trials
+        ]
+
+    def refit(self, params: dict):
+        """
+        Ajusta o modelo com os hiperparâmetros escolhidos em todos os dados
+        de treinamento
+        """
+        self.model.set_params(**params)
+        self.model.fit(self.train_data[0], self.train_data[1])
+
+        return self.model
+
     def run(self):
         """
         Executa a otimização de hiperparâmetros
         """
 
         best_params = self._optimize_model(self.model, self.train_data)
-        self.model.set_params(**best_params)
-        self.model.fit(self.train_data[0], self.train_data[1])
 
-        return self.model
+        return self.refit(best_params)
@@ -5,6 +5,7 @@ Ele é responsável por:
 - Separar os dados em conjuntos de treinamento e teste
 - Normalizar os dados
 - Salvar o objeto de pré-processamento
+- Salvar as estatísticas de treinamento usadas no monitoramento de drift
 
 Versão: 1.0.0
 Data: 06/08/2025
@@ -12,6 +13,7 @@ Autor: Nasser Boan
 nasser.boan@vert.com.br
 """
 
+import json
 import os
 import pickle
 from datetime import datetime
@@ -22,6 +24,8 @@ from sklearn.preprocessing import StandardScaler
 
 from config.settings import trainer_config
 
+STATS_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
 
 class DataPreprocessor:
     def __init__(self, data: pd.DataFrame, config=None):
@@ -68,15 +72,50 @@ class DataPreprocessor:
 
         return scaled_x_train, scaled_x_test
 
+    def _output_dir(self):
+        """
+        Diretório dos artefatos do treinamento atual
+        """
+        return f"models/{datetime.now().strftime('%Y%m%d')}"
+
     def _save_scaler(self):
         """
         Salva o objeto de pré-processamento
         """
-        path = f"models/{datetime.now().strftime('%Y%m%d')}/scaler.pkl"
+        path = f"{self._output_dir()}/scaler.pkl"
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, "wb") as f:
             pickle.dump(self.scaler, f)
 
+    def _save_feature_stats(self, x_train, y_train):
+        """
+        Salva as estatísticas das features e do target de treinamento
+        (antes da normalização), usadas na comparação com o tráfego servido
+
+        Args:
+            x_train: Features de treinamento
+            y_train: Target de treinamento
+        """
+        columns = x_train.assign(valor=y_train)
+        stats = {
+            column: {
+                "count": int(values.count()),
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "quantiles": {
+                    str(q): float(values.quantile(q)) for q in STATS_QUANTILES
+                },
+            }
+            for column, values in columns.items()
+        }
+
+        path = f"{self._output_dir()}/feature_stats.json"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(stats, f)
+
     def run(self):
         """
         Executa o pré-processamento dos dados
@@ -88,5 +127,6 @@ class DataPreprocessor:
 
         scaled_x_train, scaled_x_test = self._normalize_data(x_train, x_test)
         self._save_scaler()
+        self._save_feature_stats(x_train, y_train)
 
         return (scaled_x_train, y_train), (scaled_x_test, y_test)
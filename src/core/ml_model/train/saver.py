@@ -16,23 +16,45 @@ from loguru import logger
 
 
 class ModelSaver:
-    def __init__(self, model):
+    def __init__(
+        self,
+        model,
+        metadata: dict | None = None,
+        name: str | None = None,
+        update_manifest: bool = True,
+    ):
+        """
+        Args:
+            model: Modelo treinado
+            metadata: Informações adicionais registradas em `model_params.json`
+                (ex.: compromisso escolhido na otimização multiobjetivo)
+            name: Nome do diretório do modelo (padrão: nome da classe)
+            update_manifest: Se True, registra o diretório em `manifest.json`
+                da versão, de onde a API descobre qual modelo servir
+        """
         self.model = model
+        self.metadata = metadata or {}
+        self.name = name or model.__class__.__name__
+        self.update_manifest = update_manifest
+        self.model_path = None
 
     def run(self):
         """
         Executa o salvamento do modelo
         """
         try:
-            model_name = self.model.__class__.__name__
-            model_params = self.model.get_params()
+            model_params = {**self.model.get_params(), **self.metadata}
             model_date = datetime.now().strftime("%Y%m%d")
-            model_path = f"models/{model_date}/{model_name}"
+            model_path = f"models/{model_date}/{self.name}"
             os.makedirs(model_path, exist_ok=True)
+            self.model_path = model_path
             with open(f"{model_path}/model_params.json", "w") as f:
                 json.dump(model_params, f)
             with open(f"{model_path}/model.pkl", "wb") as f:
                 pickle.dump(self.model, f)
+            if self.update_manifest:
+                with open(f"models/{model_date}/manifest.json", "w") as f:
+                    json.dump({"model_name": self.name}, f)
             return True
         except Exception as e:
             logger.error(f"Erro ao salvar o modelo: {e}")
@@ -0,0 +1,352 @@
+"""
+Telemetria de recursos do treinamento.
+
+Ele é responsável por:
+- Medir, por etapa do orquestrador, tempo de parede, tempo de CPU (incluindo
+  processos filhos, como os workers do torneio), pico de RSS da própria etapa
+  e pico de memória alocada pelo Python (tracemalloc)
+- Registrar a duração de cada trial da otimização de hiperparâmetros
+- Salvar o relatório da execução (`run_report.json`) junto do modelo
+- Comparar dois relatórios para encontrar regressões entre execuções:
+
+    python -m src.core.ml_model.train.telemetry compare antigo.json novo.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Métricas comparadas e a variação absoluta mínima para contar como regressão
+STAGE_METRICS = {
+    "wall_s": 0.05,
+    "cpu_s": 0.05,
+    # Pico de RSS da etapa acima do RSS no início dela: não repete nas etapas
+    # seguintes a memória já ocupada antes
+    "rss_peak_delta_mb": 1.0,
+    "tracemalloc_peak_mb": 1.0,
+}
+
+
+def _max_rss_mb(children: bool = False) -> float | None:
+    """
+    Pico de RSS até agora, em MB, do processo ou (`children`) do maior
+    processo filho já encerrado
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    max_rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _proc_status_mb(field: str) -> float | None:
+    """Campo de memória de `/proc/self/status` (ex.: `VmRSS`), em MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Zera o pico de RSS do processo (`VmHWM`), para medir o pico de uma etapa
+    isolada; só disponível no Linux
+
+    Returns:
+        True se o pico foi zerado
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _children_cpu_s() -> float:
+    """
+    Tempo de CPU dos processos filhos já encerrados e aguardados (ex.: os
+    workers de um `ProcessPoolExecutor` depois do `shutdown`)
+    """
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class RunTelemetry:
+    """Telemetria de uma execução do treinamento"""
+
+    def __init__(self, config, trace_memory: bool = False):
+        """
+        Args:
+            config: Configurações do treinamento, registradas no relatório
+            trace_memory: Se True, mede o pico de memória de cada etapa com
+                tracemalloc. Deixa as alocações do Python mais lentas, então
+                os tempos e latências medidos com ele ligado ficam inflados
+        """
+        self.config = config
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.stages = []
+        self.trials = []
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_children_cpu = _children_cpu_s()
+        # Zerar o pico por etapa também zera `ru_maxrss`, então o pico da
+        # execução inteira é acumulado aqui
+        self._rss_peak_mb = _max_rss_mb()
+        if trace_memory:
+            logger.warning(
+                "tracemalloc ligado: tempos e latências medidos no treinamento "
+                "ficam inflados"
+            )
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Mede uma etapa do treinamento
+
+        Args:
+            name: Nome da etapa no relatório
+        """
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        per_stage_peak = _reset_peak_rss()
+        rss_before = _proc_status_mb("VmRSS") if per_stage_peak else _max_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        children_cpu_start = _children_cpu_s()
+
+        try:
+            yield
+        finally:
+            children_cpu = _children_cpu_s() - children_cpu_start
+            record = {
+                "name": name,
+                "wall_s": time.perf_counter() - wall_start,
+                "cpu_s": time.process_time() - cpu_start + children_cpu,
+                "children_cpu_s": children_cpu,
+                "rss_peak_mb": _proc_status_mb("VmHWM") if per_stage_peak else None,
+                "rss_peak_delta_mb": None,
+                "rss_growth_mb": None,
+                # O pico dos filhos só é atribuído à etapa em que eles rodaram
+                "children_rss_peak_mb": (
+                    _max_rss_mb(children=True) if children_cpu > 0 else None
+                ),
+                "tracemalloc_peak_mb": None,
+            }
+            # Com o pico por etapa, o crescimento é o do RSS atual; senão, o
+            # do pico do processo
+            rss_after = _proc_status_mb("VmRSS") if per_stage_peak else _max_rss_mb()
+            if rss_before is not None and rss_after is not None:
+                record["rss_growth_mb"] = rss_after - rss_before
+            if per_stage_peak and record["rss_peak_mb"] is not None:
+                record["rss_peak_delta_mb"] = record["rss_peak_mb"] - rss_before
+            self._update_rss_peak(record["rss_peak_mb"])
+            if self.trace_memory:
+                record["tracemalloc_peak_mb"] = (
+                    tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                )
+            if started_tracing:
+                tracemalloc.stop()
+            self.stages.append(record)
+            children = f" ({children_cpu:.3f}s em filhos)" if children_cpu else ""
+            logger.info(
+                f"Etapa {name}: {record['wall_s']:.3f}s de parede, "
+                f"{record['cpu_s']:.3f}s de CPU{children}"
+            )
+
+    def _update_rss_peak(self, stage_peak_mb: float | None = None):
+        for value in (stage_peak_mb, _max_rss_mb()):
+            if value is not None:
+                self._rss_peak_mb = max(self._rss_peak_mb or 0.0, value)
+
+    def record_trials(self, study):
+        """
+        Registra a duração de cada trial de um estudo do Optuna
+
+        Args:
+            study: Estudo já otimizado
+        """
+        for trial in study.trials:
+            self.trials.append(
+                {
+                    "number": trial.number,
+                    "state": trial.state.name,
+                    "duration_s": (
+                        trial.duration.total_seconds() if trial.duration else None
+                    ),
+                    "values": trial.values,
+                    "params": trial.params,
+                }
+            )
+
+    def _trials_summary(self) -> dict | None:
+        durations = [t["duration_s"] for t in self.trials if t["duration_s"]]
+        if not durations:
+            return None
+        return {
+            "n_trials": len(durations),
+            "total_s": float(np.sum(durations)),
+            "mean_s": float(np.mean(durations)),
+            "p50_s": float(np.median(durations)),
+            "p95_s": float(np.quantile(durations, 0.95)),
+            "max_s": float(np.max(durations)),
+        }
+
+    def report(self) -> dict:
+        """Relatório da execução"""
+        self._update_rss_peak()
+        return {
+            "started_at": self.started_at,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": self.config.model_dump(),
+            # Com tracemalloc ligado, tempos e latências não são comparáveis
+            # aos de execuções sem ele
+            "trace_memory": self.trace_memory,
+            "total": {
+                "wall_s": time.perf_counter() - self._start,
+                "cpu_s": time.process_time()
+                - self._start_cpu
+                + _children_cpu_s()
+                - self._start_children_cpu,
+                "rss_peak_mb": self._rss_peak_mb,
+            },
+            "stages": self.stages,
+            "hpo_trials": self._trials_summary(),
+            "trials": self.trials,
+        }
+
+    def save(self, directory: str) -> str:
+        """
+        Salva o relatório em `<directory>/run_report.json`
+
+        Returns:
+            Caminho do relatório salvo
+        """
+        path = os.path.join(directory, "run_report.json")
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        return path
+
+
+def compare_reports(old: dict, new: dict, threshold: float = 0.1) -> list[dict]:
+    """
+    Compara as métricas por etapa de dois relatórios
+
+    Args:
+        old: Relatório de referência
+        new: Relatório a ser comparado
+        threshold: Aumento relativo a partir do qual uma métrica é
+            considerada regressão (variações absolutas abaixo de
+            `STAGE_METRICS` são ignoradas)
+
+    Returns:
+        Lista com uma linha por etapa e métrica presentes nos dois relatórios
+    """
+    old_stages = {stage["name"]: stage for stage in old["stages"]}
+    new_stages = {stage["name"]: stage for stage in new["stages"]}
+    old_stages["total"] = old["total"]
+    new_stages["total"] = new["total"]
+    if old.get("hpo_trials") and new.get("hpo_trials"):
+        old_stages["hpo_trial"] = {"wall_s": old["hpo_trials"]["mean_s"]}
+        new_stages["hpo_trial"] = {"wall_s": new["hpo_trials"]["mean_s"]}
+
+    rows = []
+    for name, old_stage in old_stages.items():
+        new_stage = new_stages.get(name)
+        if new_stage is None:
+            continue
+        for metric, min_change in STAGE_METRICS.items():
+            before, after = old_stage.get(metric), new_stage.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else None
+            rows.append(
+                {
+                    "stage": name,
+                    "metric": metric,
+                    "old": before,
+                    "new": after,
+                    "change": change,
+                    "regression": change is not None
+                    and change > threshold
+                    and after - before > min_change,
+                }
+            )
+    return rows
+
+
+def _print_comparison(rows: list[dict]):
+    print(f"{'etapa':<14}{'métrica':<22}{'antigo':>12}{'novo':>12}{'variação':>11}")
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        flag = "  REGRESSÃO" if row["regression"] else ""
+        print(
+            f"{row['stage']:<14}{row['metric']:<22}{row['old']:>12.3f}"
+            f"{row['new']:>12.3f}{change:>11}{flag}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Telemetria do treinamento")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare = subparsers.add_parser(
+        "compare", help="Compara dois relatórios run_report.json"
+    )
+    compare.add_argument("old", help="Relatório de referência")
+    compare.add_argument("new", help="Relatório a ser comparado")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Aumento relativo considerado regressão (padrão: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows = compare_reports(old, new, args.threshold)
+    _print_comparison(rows)
+    if old.get("trace_memory") != new.get("trace_memory"):
+        print(
+            "\nAviso: só um dos relatórios foi gerado com tracemalloc ligado; "
+            "tempos e latências não são comparáveis"
+        )
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regressões acima de {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
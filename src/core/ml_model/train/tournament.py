@@ -0,0 +1,212 @@
+"""
+Módulo de torneio entre modelos candidatos.
+
+Ele é responsável por:
+- Treinar e avaliar vários estimadores candidatos em paralelo, em um pool
+  de processos
+- Compartilhar com os workers uma única cópia somente leitura dos dados
+  pré-processados (memória compartilhada), em vez de serializá-los para
+  cada um
+- Registrar o placar com o tempo de ajuste, o tempo de predição, a
+  latência, o tamanho e o R² de validação de cada candidato
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from loguru import logger
+from sklearn.ensemble import (
+    ExtraTreesRegressor,
+    HistGradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+
+from config.settings import trainer_config
+
+from .hpo import measure_serving_cost
+
+CANDIDATES = {
+    "RandomForestRegressor": lambda random_state: RandomForestRegressor(
+        random_state=random_state
+    ),
+    "ExtraTreesRegressor": lambda random_state: ExtraTreesRegressor(
+        random_state=random_state
+    ),
+    "HistGradientBoostingRegressor": lambda random_state: (
+        HistGradientBoostingRegressor(random_state=random_state)
+    ),
+    "Ridge": lambda random_state: Ridge(random_state=random_state),
+    "LinearRegression": lambda random_state: LinearRegression(),
+}
+
+
+def build_candidate(name: str, random_state: int):
+    """
+    Cria um estimador candidato pelo nome
+
+    Raises:
+        ValueError: Se o candidato não estiver em `CANDIDATES`
+    """
+    if name not in CANDIDATES:
+        raise ValueError(
+            f"Candidato desconhecido: {name}. Opções: {', '.join(CANDIDATES)}"
+        )
+    return CANDIDATES[name](random_state)
+
+
+def _share(array: np.ndarray, blocks: list) -> tuple:
+    """
+    Copia um array para um bloco de memória compartilhada
+
+    Returns:
+        Descritor (nome do bloco, formato, dtype) usado pelos workers
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block.name, array.shape, array.dtype.str
+
+
+def _attach(descriptor: tuple, blocks: list) -> np.ndarray:
+    """Visão somente leitura de um array em memória compartilhada"""
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _run_candidate(name: str, descriptors: dict, config) -> dict:
+    """
+    Treina e avalia um candidato (executado em um processo do pool)
+    """
+    blocks = []
+    try:
+        x_fit, y_fit, x_val, y_val = (
+            _attach(descriptors[key], blocks)
+            for key in ("x_fit", "y_fit", "x_val", "y_val")
+        )
+        model = build_candidate(name, config.random_state)
+
+        start = time.perf_counter()
+        model.fit(x_fit, y_fit)
+        fit_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = model.predict(x_val)
+        predict_s = time.perf_counter() - start
+
+        result = {
+            "name": name,
+            "val_r2": r2_score(y_val, predictions),
+            "fit_s": fit_s,
+            "predict_s": predict_s,
+            **measure_serving_cost(model, x_val, config),
+        }
+        return result
+    finally:
+        x_fit = y_fit = x_val = y_val = predictions = None
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # Ainda há referências ao bloco (ex.: no traceback de um erro);
+                # o mapeamento é liberado quando o worker termina
+                pass
+
+
+class ModelTournament:
+    """Classe para o torneio entre os estimadores candidatos"""
+
+    def __init__(self, train_data: tuple, config=None):
+        """
+        Args:
+            train_data: Tuple com os dados de treinamento (normalizados)
+            config: Configurações do treinamento (opcional)
+        """
+        self.config = config or trainer_config
+        self.train_data = train_data
+        self.leaderboard = []
+
+    def _n_workers(self) -> int:
+        n_workers = self.config.tournament_n_workers or os.cpu_count() or 1
+        return max(1, min(n_workers, len(self.config.tournament_candidates)))
+
+    def run(self) -> list[dict]:
+        """
+        Executa o torneio
+
+        Uma parte dos dados de treinamento é separada para validação, como
+        na otimização multiobjetivo.
+
+        Returns:
+            Placar ordenado pelo R² de validação; candidatos que falharam
+            aparecem no fim, com a mensagem de erro
+        """
+        for name in self.config.tournament_candidates:
+            build_candidate(name, self.config.random_state)
+
+        x_train, y_train = self.train_data
+        x_fit, x_val, y_fit, y_val = train_test_split(
+            np.asarray(x_train, dtype=np.float64),
+            np.asarray(y_train, dtype=np.float64),
+            test_size=self.config.hpo_validation_size,
+            random_state=self.config.random_state,
+        )
+
+        blocks = []
+        try:
+            descriptors = {
+                "x_fit": _share(x_fit, blocks),
+                "y_fit": _share(y_fit, blocks),
+                "x_val": _share(x_val, blocks),
+                "y_val": _share(y_val, blocks),
+            }
+            logger.info(
+                f"Torneio entre {len(self.config.tournament_candidates)} candidatos "
+                f"em {self._n_workers()} processos"
+            )
+            with ProcessPoolExecutor(max_workers=self._n_workers()) as executor:
+                futures = {
+                    name: executor.submit(
+                        _run_candidate, name, descriptors, self.config
+                    )
+                    for name in self.config.tournament_candidates
+                }
+                results, failures = [], []
+                for name, future in futures.items():
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Candidato {name} falhou: {e}")
+                        failures.append({"name": name, "error": str(e)})
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        self.leaderboard = sorted(results, key=lambda r: r["val_r2"], reverse=True)
+        self.leaderboard += failures
+        return self.leaderboard
+
+    def save(self, directory: str, winner: dict) -> str:
+        """
+        Salva o placar em `<directory>/leaderboard.json`
+
+        Returns:
+            Caminho do placar salvo
+        """
+        path = os.path.join(directory, "leaderboard.json")
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"winner": winner, "leaderboard": self.leaderboard}, f, indent=2)
+        return path
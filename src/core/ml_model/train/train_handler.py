@@ -6,10 +6,12 @@ Esse módulo é responsável por orquestrar o treinamento do modelo de prediçã
 Ele é responsável por:
 - Gerar dados de treinamento
 - Pré-processar dados
-- Treinar o modelo
+- Treinar o modelo (ou um torneio entre estimadores candidatos)
 - Otimizar o modelo
 - Avaliar o modelo
+- Destilar o modelo em um substituto compacto (opcional)
 - Salvar o modelo
+- Registrar a telemetria de recursos de cada etapa (`run_report.json`)
 
 Versão: 1.0.0
 Data: 06/08/2025
@@ -22,10 +24,13 @@ from loguru import logger
 from config.settings import trainer_config
 
 from .data_gen import DataGenerator
+from .distill import ModelDistiller
 from .eval import ModelEvaluator
-from .hpo import ModelHPO
+from .hpo import ModelHPO, measure_serving_cost
 from .pre_process import DataPreprocessor
 from .saver import ModelSaver
+from .telemetry import RunTelemetry
+from .tournament import ModelTournament, build_candidate
 from .train_model import ModelTrainer
 
 logger.add("logs/train.log", level="INFO", rotation="10 MB")
@@ -37,6 +42,15 @@ class ModelOrchestrator:
     def __init__(self, config=None):
         logger.info("Inicializando ModelTrainer")
         self.config = config or trainer_config
+        self.trade_off = None
+        self.scaler = None
+        self.model_path = None
+        self.tournament = None
+        self.winner = None
+        self.final_model = None
+        self.telemetry = RunTelemetry(
+            self.config, trace_memory=self.config.telemetry_trace_memory
+        )
 
     def _generate_data(self):
         data_generator = DataGenerator(self.config)
@@ -44,22 +58,153 @@ class ModelOrchestrator:
 
     def _preprocess_data(self, data):
         preprocessor = DataPreprocessor(data, self.config)
-        return preprocessor.run()
+        processed_data = preprocessor.run()
+        self.scaler = preprocessor.scaler
+        return processed_data
 
     def _train_model(self, data):
-        model_trainer = ModelTrainer(data, self.config)
+        estimator = None
+        if self.config.tournament_candidates:
+            self.winner = self._run_tournament(data)
+            estimator = build_candidate(self.winner["name"], self.config.random_state)
+        model_trainer = ModelTrainer(data, self.config, estimator)
         return model_trainer.run()
 
+    def _run_tournament(self, data):
+        """
+        Executa o torneio entre os candidatos e escolhe o de maior R² de
+        validação que respeita os orçamentos de latência e tamanho
+        """
+        self.tournament = ModelTournament(data, self.config)
+        leaderboard = [c for c in self.tournament.run() if "error" not in c]
+        if not leaderboard:
+            raise RuntimeError("Todos os candidatos do torneio falharam")
+        winner, within_budgets = self._select_within_budgets(leaderboard)
+        logger.info(f"Vencedor do torneio: {winner['name']}")
+        return {**winner, "within_budgets": within_budgets, "budgets": self._budgets()}
+
     def _optimize_model(self, model, train_data):
+        if not ModelHPO.supports(model):
+            logger.info(
+                f"Otimização ignorada: espaço de busca não se aplica a "
+                f"{model.__class__.__name__}"
+            )
+            return model
+
         hpo = ModelHPO(model, train_data, self.config)
-        return hpo.run()
+        # O vencedor do torneio foi escolhido dentro dos orçamentos; a
+        # otimização só de R² poderia tirá-lo deles
+        multi_objective = self.config.hpo_multi_objective or bool(
+            self.config.tournament_candidates
+        )
+        if not multi_objective:
+            optimized_model = hpo.run()
+            self.telemetry.record_trials(hpo.study)
+            return optimized_model
+
+        pareto_front = hpo.search_pareto_front()
+        self.telemetry.record_trials(hpo.study)
+        self.trade_off = self._select_trade_off(pareto_front)
+        logger.info(f"Compromisso escolhido na fronteira de Pareto: {self.trade_off}")
+        return hpo.refit(self.trade_off["params"])
+
+    def _check_final_model(self, model, train_data):
+        """
+        Mede os custos de servir o modelo final, já otimizado e ajustado em
+        todos os dados de treinamento, e verifica de novo os orçamentos que
+        guiaram a escolha do vencedor ou do compromisso
+        """
+        cost = measure_serving_cost(model, train_data[0], self.config)
+        within_budgets = self._budget_violation(cost) == 0
+        self.final_model = {
+            **cost,
+            "within_budgets": within_budgets,
+            "budgets": self._budgets(),
+        }
+        if self.winner:
+            self.winner["within_budgets"] = within_budgets
+        if self.trade_off:
+            self.trade_off["within_budgets"] = within_budgets
+        if not within_budgets:
+            logger.warning(f"Modelo final excede os orçamentos: {self.final_model}")
+
+    def _budgets(self):
+        return {
+            "single_latency_ms": self.config.max_single_latency_ms,
+            "batch_latency_ms": self.config.max_batch_latency_ms,
+            "model_size_mb": self.config.max_model_size_mb,
+        }
+
+    def _budget_violation(self, candidate):
+        """
+        Soma dos excessos relativos de cada orçamento (0 se todos forem
+        respeitados)
+        """
+        return sum(
+            max(candidate[objective] / budget - 1, 0)
+            for objective, budget in self._budgets().items()
+            if budget is not None
+        )
+
+    def _select_within_budgets(self, candidates):
+        """
+        Escolhe o candidato de maior R² de validação que respeita os
+        orçamentos de latência e tamanho do `TrainerConfig`. Se nenhum
+        respeitar, escolhe o que menos excede os orçamentos.
+
+        Returns:
+            Tuple com o candidato escolhido e se ele respeita os orçamentos
+        """
+        within_budgets = [c for c in candidates if self._budget_violation(c) == 0]
+        if within_budgets:
+            return max(within_budgets, key=lambda c: c["val_r2"]), True
+
+        logger.warning("Nenhum candidato respeita os orçamentos")
+        return min(candidates, key=self._budget_violation), False
+
+    def _select_trade_off(self, pareto_front):
+        """
+        Escolhe o compromisso na fronteira de Pareto
+        """
+        chosen, within_budgets = self._select_within_budgets(pareto_front)
+
+        return {
+            **chosen,
+            "within_budgets": within_budgets,
+            "budgets": self._budgets(),
+            "pareto_front_size": len(pareto_front),
+        }
 
     def _evaluate_model(self, model, test_data):
         evaluator = ModelEvaluator(model, test_data)
         return evaluator.run()
 
+    def _distill_model(self, model, train_data, test_data):
+        distiller = ModelDistiller(
+            model, self.scaler, train_data, test_data, self.config
+        )
+        return distiller.run()
+
     def _save_model(self, model):
-        saver = ModelSaver(model)
+        metadata = {}
+        if self.trade_off:
+            metadata["trade_off"] = self.trade_off
+        if self.winner:
+            metadata["tournament_winner"] = self.winner
+        if self.final_model:
+            metadata["final_model"] = self.final_model
+        saver = ModelSaver(model, metadata)
+        saved = saver.run()
+        self.model_path = saver.model_path
+        return saved
+
+    def _save_surrogate(self, surrogate, report):
+        saver = ModelSaver(
+            surrogate,
+            {"distillation": report},
+            name="surrogate",
+            update_manifest=False,
+        )
         return saver.run()
 
     def run(self):
@@ -67,20 +212,49 @@ class ModelOrchestrator:
         Executa o treinamento do modelo de predição de casas
         """
         logger.info("Iniciando treinamento do modelo de predição de casas")
-        data = self._generate_data()
+        with self.telemetry.stage("generate"):
+            data = self._generate_data()
         logger.info("Dados gerados com sucesso")
-        train_data, test_data = self._preprocess_data(data)
+        with self.telemetry.stage("preprocess"):
+            train_data, test_data = self._preprocess_data(data)
         logger.info("Dados pré-processados com sucesso")
-        model = self._train_model(train_data)
+        with self.telemetry.stage("train"):
+            model = self._train_model(train_data)
         logger.info("Modelo treinado com sucesso")
-        optimized_model = self._optimize_model(model, train_data)
+        with self.telemetry.stage("hpo"):
+            optimized_model = self._optimize_model(model, train_data)
+            if self.winner or self.trade_off:
+                self._check_final_model(optimized_model, train_data)
         logger.info("Modelo otimizado com sucesso")
-        score = self._evaluate_model(optimized_model, test_data)
+        with self.telemetry.stage("evaluate"):
+            score = self._evaluate_model(optimized_model, test_data)
         logger.info(f"Modelo avaliado com sucesso com score de {score}")
-        if self._save_model(optimized_model):
+        with self.telemetry.stage("save"):
+            saved = self._save_model(optimized_model)
+        if saved:
             logger.info("Modelo salvo com sucesso")
         else:
             logger.error("Erro ao salvar o modelo")
+        if self.config.distill:
+            with self.telemetry.stage("distill"):
+                surrogate, report = self._distill_model(
+                    optimized_model, train_data, test_data
+                )
+            logger.info("Modelo destilado com sucesso")
+            if not report["accepted"]:
+                logger.warning(
+                    "Substituto descartado: " + "; ".join(report["rejection_reasons"])
+                )
+            elif self._save_surrogate(surrogate, report):
+                logger.info("Substituto salvo com sucesso")
+            else:
+                logger.error("Erro ao salvar o substituto")
+        if self.tournament and self.model_path:
+            path = self.tournament.save(self.model_path, self.winner)
+            logger.info(f"Placar do torneio salvo em {path}")
+        if self.model_path:
+            path = self.telemetry.save(self.model_path)
+            logger.info(f"Relatório de telemetria salvo em {path}")
         logger.info("Treinamento do modelo de predição de casas concluído com sucesso")
 
 
@@ -19,23 +19,27 @@ from config.settings import trainer_config
 class ModelTrainer:
     """Classe para treinamento do modelo de predição de casas"""
 
-    def __init__(self, train_data: tuple, config=None):
+    def __init__(self, train_data: tuple, config=None, estimator=None):
         """
         Inicializa o treinador
 
         Args:
             train_data: Tuple com os dados de treinamento
             config: Configurações do treinamento (opcional)
+            estimator: Estimador a ser treinado (padrão: Random Forest)
         """
         self.config = config or trainer_config
         self.train_data = train_data
+        self.estimator = estimator
 
     def _train_model(self):
         """
         Treina o modelo
         """
         x_train, y_train = self.train_data
-        model = RandomForestRegressor(random_state=self.config.random_state)
+        model = self.estimator
+        if model is None:
+            model = RandomForestRegressor(random_state=self.config.random_state)
         model.fit(x_train, y_train)
         return model
 
@@ -0,0 +1,21 @@
+"""
+Módulo de monitoramento - Estatísticas em streaming do tráfego servido
+"""
+
+from .serving_stats import (
+    ServingStats,
+    compare_with_training,
+    load_training_stats,
+    serving_stats,
+)
+from .sketches import QuantileSketch, RunningMoments, ValueCounter
+
+__all__ = [
+    "ServingStats",
+    "QuantileSketch",
+    "RunningMoments",
+    "ValueCounter",
+    "compare_with_training",
+    "load_training_stats",
+    "serving_stats",
+]
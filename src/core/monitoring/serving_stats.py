@@ -0,0 +1,172 @@
+"""
+Estatísticas em streaming das entradas e predições servidas
+
+Mantém, em memória limitada, um resumo do tráfego servido para detectar
+drift em relação às estatísticas de treinamento salvas junto do scaler.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+from .sketches import QuantileSketch, RunningMoments, ValueCounter
+
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+FEATURES = ("quartos", "tamanho", "banheiros")
+
+
+class ServingStats:
+    """
+    Resumo em streaming das requisições servidas.
+
+    - `tamanho`: sketch de quantis + média/variância
+    - `quartos` e `banheiros`: contagem por valor
+    - predições: sketch de quantis + média/variância
+    """
+
+    def __init__(self, max_count_value: int = 10):
+        """
+        Args:
+            max_count_value: Maior valor contado individualmente para
+                `quartos` e `banheiros`
+        """
+        self._lock = threading.Lock()
+        self.n_requests = 0
+        self.n_rejected = 0
+        self.tamanho = QuantileSketch()
+        self.tamanho_moments = RunningMoments()
+        self.quartos = ValueCounter(max_count_value)
+        self.banheiros = ValueCounter(max_count_value)
+        self.prediction = QuantileSketch()
+        self.prediction_moments = RunningMoments()
+
+    def observe(
+        self, quartos: int, tamanho: float, banheiros: int, prediction: float | None
+    ):
+        """
+        Registra uma requisição servida
+
+        Args:
+            quartos: Número de quartos
+            tamanho: Tamanho da casa
+            banheiros: Número de banheiros
+            prediction: Predição devolvida, ou None se as regras de negócio
+                rejeitaram a requisição
+        """
+        with self._lock:
+            self.n_requests += 1
+            self.quartos.add(quartos)
+            self.banheiros.add(banheiros)
+            self.tamanho.add(tamanho)
+            self.tamanho_moments.add(tamanho)
+            if prediction is None:
+                self.n_rejected += 1
+            else:
+                self.prediction.add(prediction)
+                self.prediction_moments.add(prediction)
+
+    def observe_batch(
+        self, features: np.ndarray, predictions: np.ndarray, accepted: np.ndarray
+    ):
+        """
+        Registra um lote de requisições servidas, de forma vetorizada
+
+        Args:
+            features: Matriz (n, 3) com as colunas de `FEATURES`
+            predictions: Predições devolvidas
+            accepted: Máscara das linhas aceitas pelas regras de negócio (as
+                demais contam como rejeitadas, sem predição)
+        """
+        features = np.asarray(features)
+        accepted = np.asarray(accepted, dtype=bool)
+        served = np.asarray(predictions, dtype=np.float64)[accepted]
+        with self._lock:
+            self.n_requests += len(features)
+            self.n_rejected += int(len(features) - accepted.sum())
+            self.quartos.add_many(features[:, 0])
+            self.tamanho.add_many(features[:, 1])
+            self.tamanho_moments.add_many(features[:, 1])
+            self.banheiros.add_many(features[:, 2])
+            self.prediction.add_many(served)
+            self.prediction_moments.add_many(served)
+
+    def merge(self, other: "ServingStats"):
+        """Agrega as estatísticas de outra instância (ex.: outro worker)"""
+        with self._lock:
+            self.n_requests += other.n_requests
+            self.n_rejected += other.n_rejected
+            self.tamanho.merge(other.tamanho)
+            self.tamanho_moments.merge(other.tamanho_moments)
+            self.quartos.merge(other.quartos)
+            self.banheiros.merge(other.banheiros)
+            self.prediction.merge(other.prediction)
+            self.prediction_moments.merge(other.prediction_moments)
+        return self
+
+    def summary(self) -> dict:
+        """Resumo atual das estatísticas servidas"""
+        with self._lock:
+            return {
+                "n_requests": self.n_requests,
+                "n_rejected": self.n_rejected,
+                "features": {
+                    "quartos": self.quartos.to_dict(),
+                    "tamanho": _sketch_summary(self.tamanho, self.tamanho_moments),
+                    "banheiros": self.banheiros.to_dict(),
+                },
+                "prediction": _sketch_summary(self.prediction, self.prediction_moments),
+            }
+
+
+def _sketch_summary(sketch: QuantileSketch, moments: RunningMoments) -> dict:
+    return {
+        **moments.to_dict(),
+        "quantiles": {str(q): sketch.quantile(q) for q in QUANTILES},
+    }
+
+
+def load_training_stats(path: str) -> dict | None:
+    """
+    Carrega as estatísticas de treinamento salvas junto do scaler
+
+    Args:
+        path: Caminho do arquivo `feature_stats.json`
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _column_drift(serving: dict, training: dict) -> dict:
+    drift = {"mean_shift_std": None, "quantile_shift": {}}
+    if serving.get("mean") is not None and training.get("std"):
+        drift["mean_shift_std"] = (serving["mean"] - training["mean"]) / training["std"]
+    for q, value in serving.get("quantiles", {}).items():
+        reference = training.get("quantiles", {}).get(q)
+        if value is not None and reference is not None:
+            drift["quantile_shift"][q] = value - reference
+    return drift
+
+
+def compare_with_training(summary: dict, training: dict) -> dict:
+    """
+    Compara o resumo servido com as estatísticas de treinamento
+
+    Para cada feature (e para as predições, em relação ao target `valor`)
+    retorna o deslocamento da média em desvios-padrão de treinamento e a
+    diferença de cada quantil disponível.
+    """
+    drift = {
+        feature: _column_drift(summary["features"][feature], training[feature])
+        for feature in FEATURES
+        if feature in training
+    }
+    if "valor" in training:
+        drift["prediction"] = _column_drift(summary["prediction"], training["valor"])
+    return drift
+
+
+serving_stats = ServingStats()
@@ -0,0 +1,264 @@
+"""
+Estruturas de resumo em streaming com memória limitada
+
+Todas as estruturas têm atualização O(1), tamanho máximo fixo e podem ser
+combinadas (`merge`) para agregar estatísticas de vários workers. `add_many`
+adiciona um lote de valores de forma vetorizada, equivalente a chamar `add`
+para cada um.
+"""
+
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo garantido (no estilo do DDSketch).
+
+    Cada valor é contado em um bucket logarítmico de índice
+    `ceil(log_gamma(|x|))`, de modo que qualquer quantil estimado fica a no
+    máximo `relative_accuracy` do valor real. Quando o número de buckets passa
+    de `max_buckets`, os buckets de menor índice são agrupados, preservando a
+    precisão nos valores de maior magnitude.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        min_value: float = 1e-9,
+    ):
+        """
+        Args:
+            relative_accuracy: Erro relativo máximo dos quantis estimados
+            max_buckets: Quantidade máxima de buckets por sinal
+            min_value: Valores com módulo abaixo disso são contados como zero
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self._log_gamma = math.log(self.gamma)
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        """Adiciona um valor ao sketch"""
+        self.count += 1
+        if value > self.min_value:
+            store = self.positive
+        elif value < -self.min_value:
+            store = self.negative
+            value = -value
+        else:
+            self.zero_count += 1
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        if index in store:
+            store[index] += 1
+        else:
+            store[index] = 1
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+
+    def add_many(self, values: np.ndarray):
+        """Adiciona um lote de valores ao sketch"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.count += len(values)
+        positive = values > self.min_value
+        negative = values < -self.min_value
+        self.zero_count += int(len(values) - positive.sum() - negative.sum())
+        for store, magnitudes in (
+            (self.positive, values[positive]),
+            (self.negative, -values[negative]),
+        ):
+            if not len(magnitudes):
+                continue
+            indices, counts = np.unique(
+                np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64),
+                return_counts=True,
+            )
+            for index, count in zip(indices.tolist(), counts.tolist(), strict=True):
+                store[index] = store.get(index, 0) + count
+            while len(store) > self.max_buckets:
+                self._collapse(store)
+
+    def _collapse(self, store: dict[int, int]):
+        """Agrupa os dois buckets de menor índice"""
+        lowest, second = sorted(store)[:2]
+        store[second] += store.pop(lowest)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estima o quantil `q` (entre 0 e 1) dos valores observados
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive))
+
+    def merge(self, other: "QuantileSketch"):
+        """Incorpora as contagens de outro sketch com a mesma precisão"""
+        if other.gamma != self.gamma:
+            raise ValueError(
+                "Sketches com precisões diferentes não podem ser combinados"
+            )
+        for own, theirs in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for index, count in theirs.items():
+                own[index] = own.get(index, 0) + count
+            while len(own) > self.max_buckets:
+                self._collapse(own)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+
+class RunningMoments:
+    """
+    Contagem, média, variância, mínimo e máximo pelo algoritmo de Welford
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Adiciona um valor"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values: np.ndarray):
+        """Adiciona um lote de valores, combinando os momentos do lote"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        batch = RunningMoments()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch._m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    @property
+    def variance(self) -> float | None:
+        if self.count < 2:
+            return None
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float | None:
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    def merge(self, other: "RunningMoments"):
+        """Combina com outro acumulador (fórmula de Chan et al.)"""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta**2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "std": self.std,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+
+class ValueCounter:
+    """
+    Contagem por valor para features inteiras de domínio pequeno
+
+    Valores fora de `[0, max_value]` são acumulados em `other`.
+    """
+
+    def __init__(self, max_value: int):
+        self.counts = [0] * (max_value + 1)
+        self.other = 0
+
+    def add(self, value: int):
+        """Conta um valor"""
+        if 0 <= value < len(self.counts):
+            self.counts[value] += 1
+        else:
+            self.other += 1
+
+    def add_many(self, values: np.ndarray):
+        """Conta um lote de valores"""
+        values = np.asarray(values).ravel()
+        in_range = (values >= 0) & (values < len(self.counts))
+        counts = np.bincount(
+            values[in_range].astype(np.int64), minlength=len(self.counts)
+        )
+        for value, count in enumerate(counts.tolist()):
+            self.counts[value] += count
+        self.other += int(len(values) - in_range.sum())
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts) + self.other
+
+    @property
+    def mean(self) -> float | None:
+        total = sum(self.counts)
+        if total == 0:
+            return None
+        return sum(value * count for value, count in enumerate(self.counts)) / total
+
+    def merge(self, other: "ValueCounter"):
+        """Soma as contagens de outro contador"""
+        for value, count in enumerate(other.counts):
+            self.counts[value] += count
+        self.other += other.other
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "counts": {
+                str(value): count for value, count in enumerate(self.counts) if count
+            },
+            "other": self.other,
+        }
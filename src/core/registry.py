@@ -0,0 +1,212 @@
+"""
+Registro das versões do modelo em memória
+
+Carrega sob demanda os artefatos de `models_path/<versão>/` na primeira vez
+em que uma versão é pedida e os mantém residentes sob um orçamento total de
+memória, descartando as versões usadas há mais tempo (LRU). Requisições
+concorrentes compartilham a mesma instância carregada e disparam uma única
+carga por versão.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+
+from loguru import logger
+
+from config.settings import app_config
+
+from .house_predictor import HousePredictorApp
+
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+class ModelVersionNotFoundError(LookupError):
+    """Versão do modelo inexistente ou com nome inválido"""
+
+
+class ModelRegistry:
+    """Versões do modelo carregadas sob demanda, com despejo LRU"""
+
+    def __init__(
+        self,
+        models_path: str,
+        default_version: str,
+        budget_mb: float,
+        loader=None,
+    ):
+        """
+        Args:
+            models_path: Diretório com uma pasta de artefatos por versão
+            default_version: Versão usada quando nenhuma é pedida
+            budget_mb: Orçamento de memória para as versões residentes (MB)
+            loader: Função `versão -> HousePredictorApp` (opcional)
+        """
+        self.models_path = models_path
+        self.default_version = default_version
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.loader = loader or (lambda version: HousePredictorApp(model_date=version))
+
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()  # versão -> (HousePredictorApp, bytes)
+        self._loading = {}  # versão -> Future da carga em andamento
+        self._loads = {}
+        self._evictions = {}
+        self._hits = {}
+
+    @staticmethod
+    def _artifact_paths(version: str) -> list[str]:
+        """Artefatos carregados para servir a versão"""
+        return [
+            app_config.scaler_path_for(version),
+            app_config.serving_model_path_for(version),
+        ]
+
+    def _is_servable(self, version: str) -> bool:
+        """Se a pasta da versão tem todos os artefatos necessários"""
+        return all(os.path.isfile(path) for path in self._artifact_paths(version))
+
+    def _validate(self, version: str):
+        if not VERSION_PATTERN.match(version):
+            raise ModelVersionNotFoundError(f"Versão inválida: {version!r}")
+        if not os.path.isdir(os.path.join(self.models_path, version)):
+            raise ModelVersionNotFoundError(f"Versão não encontrada: {version}")
+        if not self._is_servable(version):
+            raise ModelVersionNotFoundError(
+                f"Versão {version} sem os artefatos necessários para servir"
+            )
+
+    def _artifact_bytes(self, version: str) -> int:
+        """
+        Tamanho dos artefatos carregados, usado como estimativa da memória
+        ocupada pela versão
+        """
+        return sum(
+            os.path.getsize(path)
+            for path in self._artifact_paths(version)
+            if os.path.exists(path)
+        )
+
+    def _evict(self):
+        """Descarta as versões menos usadas até caber no orçamento"""
+        resident_bytes = sum(size for _, size in self._resident.values())
+        # A versão mais recente nunca é descartada, mesmo acima do orçamento
+        while resident_bytes > self.budget_bytes and len(self._resident) > 1:
+            version, (_, size) = self._resident.popitem(last=False)
+            resident_bytes -= size
+            self._evictions[version] = self._evictions.get(version, 0) + 1
+            logger.info(f"Versão {version} descartada da memória ({size} bytes)")
+        if resident_bytes > self.budget_bytes:
+            logger.warning(
+                f"Versões residentes ocupam {resident_bytes} bytes, acima do "
+                f"orçamento de {self.budget_bytes} bytes"
+            )
+
+    def get(self, version: str | None = None) -> HousePredictorApp:
+        """
+        Instância de `HousePredictorApp` da versão pedida, carregando-a se
+        necessário
+
+        Args:
+            version: Versão do modelo (por padrão, `default_version`)
+
+        Raises:
+            ModelVersionNotFoundError: Se a versão não existir
+        """
+        version = version or self.default_version
+        with self._lock:
+            if version in self._resident:
+                self._resident.move_to_end(version)
+                self._hits[version] = self._hits.get(version, 0) + 1
+                return self._resident[version][0]
+
+            future = self._loading.get(version)
+            owner = future is None
+            if owner:
+                self._validate(version)
+                future = Future()
+                self._loading[version] = future
+
+        if not owner:
+            # Outra requisição já está carregando essa versão
+            return future.result()
+
+        try:
+            logger.info(f"Carregando versão {version} do modelo")
+            predictor = self.loader(version)
+            size = self._artifact_bytes(version)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[version]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[version]
+            self._resident[version] = (predictor, size)
+            self._loads[version] = self._loads.get(version, 0) + 1
+            self._evict()
+        future.set_result(predictor)
+
+        return predictor
+
+    def available_versions(self) -> list[str]:
+        """Versões em `models_path` com todos os artefatos para servir"""
+        if not os.path.isdir(self.models_path):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.models_path)
+            if VERSION_PATTERN.match(name)
+            and os.path.isdir(os.path.join(self.models_path, name))
+            and self._is_servable(name)
+        )
+
+    def stats(self) -> dict:
+        """Versões residentes, cargas, acertos e despejos por versão"""
+        with self._lock:
+            versions = set(self._loads) | set(self._resident)
+            return {
+                "default_version": self.default_version,
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": sum(size for _, size in self._resident.values()),
+                "resident": list(self._resident),
+                "loading": list(self._loading),
+                "versions": {
+                    version: {
+                        "resident": version in self._resident,
+                        "resident_bytes": self._resident.get(version, (None, 0))[1],
+                        "loads": self._loads.get(version, 0),
+                        "hits": self._hits.get(version, 0),
+                        "evictions": self._evictions.get(version, 0),
+                    }
+                    for version in sorted(versions)
+                },
+            }
+
+
+@lru_cache(maxsize=1)
+def get_model_registry() -> ModelRegistry:
+    """Registro compartilhado pelas interfaces da aplicação"""
+    return ModelRegistry(
+        models_path=app_config.models_path,
+        default_version=app_config.model_date,
+        budget_mb=app_config.model_registry_budget_mb,
+    )
+
+
+def get_house_predictor(version: str | None = None) -> HousePredictorApp:
+    """
+    Instância compartilhada de `HousePredictorApp`
+
+    Evita recarregar o scaler e o modelo a cada requisição e permite que
+    as diferentes interfaces (HTTP e socket Unix) sirvam o mesmo modelo
+    carregado.
+
+    Args:
+        version: Versão do modelo (por padrão, `app_config.model_date`)
+    """
+    return get_model_registry().get(version)
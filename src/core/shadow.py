@@ -0,0 +1,210 @@
+"""
+Avaliação em sombra de um modelo candidato
+
+As features de cada requisição servida e a predição do modelo em produção
+são copiadas para uma fila limitada. Uma thread separada consome a fila em
+lotes, prediz com o modelo candidato e acumula estatísticas de concordância
+entre os dois. A requisição original nunca espera pela sombra: a fila é
+limitada em linhas, o que não cabe nela é descartado e o envio só disputa o
+contador da fila, nunca as estatísticas de concordância.
+
+O candidato é carregado uma única vez pela própria thread, fora do registro
+de versões, para não ocupar o orçamento de memória do registro nem despejar
+a versão servida.
+"""
+
+import queue
+import threading
+from functools import lru_cache
+
+import numpy as np
+from loguru import logger
+
+from config.settings import app_config
+
+from .house_predictor import HousePredictorApp
+from .monitoring import QuantileSketch, RunningMoments
+from .monitoring.serving_stats import QUANTILES
+
+
+class ShadowScorer:
+    """Compara as predições servidas com as de um modelo candidato"""
+
+    def __init__(
+        self,
+        candidate_version: str,
+        queue_rows: int = 10000,
+        batch_size: int = 256,
+        loader=None,
+    ):
+        """
+        Args:
+            candidate_version: Versão do modelo candidato em `models_path`
+            queue_rows: Máximo de linhas aguardando na fila
+            batch_size: Máximo de linhas avaliadas por lote
+            loader: Função `versão -> HousePredictorApp` (opcional)
+        """
+        self.candidate_version = candidate_version
+        self.queue_rows = queue_rows
+        self.batch_size = batch_size
+        self.loader = loader or (lambda version: HousePredictorApp(model_date=version))
+        self._candidate = None
+        # O limite é em linhas, não em envios: um envio pode ser um lote
+        # inteiro. `_queued_rows`, `n_submitted` e `n_dropped` são protegidos
+        # por `_queue_lock`, o único lock tomado no caminho da requisição;
+        # as estatísticas de concordância, por `_stats_lock`
+        self._queue = queue.Queue()
+        self._queued_rows = 0
+        self._queue_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.n_submitted = 0
+        self.n_dropped = 0
+        self.n_scored = 0
+        self.n_rejected = 0
+        self.n_errors = 0
+        self.delta = QuantileSketch()
+        self.delta_moments = RunningMoments()
+        self.abs_delta = QuantileSketch()
+        self.abs_delta_moments = RunningMoments()
+        self.relative_delta = QuantileSketch()
+
+        self._worker = threading.Thread(
+            target=self._run, name="shadow-scorer", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, features, predictions):
+        """
+        Envia linhas servidas para a avaliação em sombra, sem bloquear
+
+        Só as linhas que cabem na fila são enviadas; as demais são
+        descartadas e contadas em `n_dropped`.
+
+        Args:
+            features: Linhas (quartos, tamanho, banheiros)
+            predictions: Predições servidas pelo modelo em produção
+        """
+        n_rows = len(features)
+        with self._queue_lock:
+            accepted = min(n_rows, self.queue_rows - self._queued_rows)
+            self._queued_rows += accepted
+            self.n_submitted += n_rows
+            self.n_dropped += n_rows - accepted
+        if accepted == n_rows:
+            self._queue.put_nowait((features, predictions))
+        elif accepted > 0:
+            self._queue.put_nowait((features[:accepted], predictions[:accepted]))
+
+    def _next_batch(self):
+        """Aguarda um envio e junta os seguintes até `batch_size` linhas"""
+        items = [self._queue.get()]
+        n_rows = len(items[0][0])
+        while n_rows < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            n_rows += len(item[0])
+        with self._queue_lock:
+            self._queued_rows -= n_rows
+
+        features = np.concatenate(
+            [np.asarray(f, dtype=np.float64).reshape(-1, 3) for f, _ in items]
+        )
+        live = np.concatenate(
+            [np.asarray(p, dtype=np.float64).reshape(-1) for _, p in items]
+        )
+        return features, live
+
+    def _predict(self, features: np.ndarray) -> np.ndarray:
+        if self._candidate is None:
+            logger.info(f"Carregando o modelo candidato {self.candidate_version}")
+            self._candidate = self.loader(self.candidate_version)
+        return self._candidate.predict_batch(features, record_stats=False)
+
+    def _run(self):
+        while True:
+            features, live = self._next_batch()
+            try:
+                shadow = self._predict(features)
+            except Exception as e:
+                logger.error(f"Erro na avaliação em sombra: {e}")
+                with self._stats_lock:
+                    self.n_errors += len(features)
+                continue
+            self._observe(live, shadow)
+
+    def _observe(self, live: np.ndarray, shadow: np.ndarray):
+        # Linhas rejeitadas pelas regras de negócio (-1) não têm predição
+        accepted = (live != -1) & (shadow != -1)
+        deltas = (shadow - live)[accepted]
+        abs_deltas = np.abs(deltas)
+        relative = abs_deltas / np.maximum(np.abs(live[accepted]), 1e-9)
+
+        # O lote é resumido fora do lock; sob ele, só as estruturas são
+        # combinadas
+        batch = [
+            (self.delta, QuantileSketch(), deltas),
+            (self.delta_moments, RunningMoments(), deltas),
+            (self.abs_delta, QuantileSketch(), abs_deltas),
+            (self.abs_delta_moments, RunningMoments(), abs_deltas),
+            (self.relative_delta, QuantileSketch(), relative),
+        ]
+        for _, summary, values in batch:
+            summary.add_many(values)
+
+        with self._stats_lock:
+            self.n_scored += len(live)
+            self.n_rejected += int((~accepted).sum())
+            for total, summary, _ in batch:
+                total.merge(summary)
+
+    def report(self) -> dict:
+        """Estatísticas de concordância entre o modelo servido e o candidato"""
+
+        def quantiles(sketch):
+            return {str(q): sketch.quantile(q) for q in QUANTILES}
+
+        with self._queue_lock:
+            queue_stats = {
+                "n_submitted": self.n_submitted,
+                "n_dropped": self.n_dropped,
+                "queued_rows": self._queued_rows,
+            }
+        with self._stats_lock:
+            return {
+                "candidate_version": self.candidate_version,
+                **queue_stats,
+                "n_scored": self.n_scored,
+                "n_rejected": self.n_rejected,
+                "n_errors": self.n_errors,
+                "mean_absolute_difference": (
+                    self.abs_delta_moments.mean
+                    if self.abs_delta_moments.count
+                    else None
+                ),
+                "delta": {
+                    **self.delta_moments.to_dict(),
+                    "quantiles": quantiles(self.delta),
+                },
+                "abs_delta": {"quantiles": quantiles(self.abs_delta)},
+                "relative_abs_delta": {"quantiles": quantiles(self.relative_delta)},
+            }
+
+
+@lru_cache(maxsize=1)
+def get_shadow_scorer() -> ShadowScorer | None:
+    """
+    Avaliação em sombra compartilhada, ou None se `shadow_model_date` não
+    estiver definido
+    """
+    if not app_config.shadow_model_date:
+        return None
+    logger.info(f"Avaliação em sombra do modelo {app_config.shadow_model_date}")
+    return ShadowScorer(
+        candidate_version=app_config.shadow_model_date,
+        queue_rows=app_config.shadow_queue_rows,
+        batch_size=app_config.shadow_batch_size,
+    )
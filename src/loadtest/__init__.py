@@ -0,0 +1,18 @@
+"""
+Módulo Loadtest - Teste de carga da API de predição
+
+Uso: `python -m src.loadtest --help`
+"""
+
+from .runner import Workload, closed_loop_step, find_saturation, open_loop_step
+from .targets import AsgiTarget, HttpTarget, TargetError
+
+__all__ = [
+    "AsgiTarget",
+    "HttpTarget",
+    "TargetError",
+    "Workload",
+    "closed_loop_step",
+    "find_saturation",
+    "open_loop_step",
+]
@@ -0,0 +1,157 @@
+"""
+Teste de carga da API de predição
+
+Exemplos:
+    # Malha fechada, aplicação no próprio processo
+    python -m src.loadtest --mode closed --levels 1,2,4,8,16,32
+
+    # Malha aberta contra um servidor em execução (make run-api)
+    python -m src.loadtest --mode open --levels 50,100,200 --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from loguru import logger
+
+from .runner import Workload, closed_loop_step, find_saturation, open_loop_step
+from .targets import AsgiTarget, HttpTarget
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga da API de predição")
+    parser.add_argument(
+        "--mode",
+        choices=["closed", "open"],
+        default="closed",
+        help="closed: concorrência fixa; open: taxa de chegada fixa",
+    )
+    parser.add_argument(
+        "--levels",
+        default="1,2,4,8,16,32",
+        help="Degraus separados por vírgula (concorrência ou requisições/s)",
+    )
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="URL de um servidor em execução (padrão: aplicação no processo)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Casas por requisição (acima de 1 usa /api/v1/predict/batch)",
+    )
+    parser.add_argument("--path", default=None, help="Caminho do endpoint")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos/degrau")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Aquecimento (s)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Timeout (s)")
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1000,
+        help="Máximo de requisições pendentes na malha aberta",
+    )
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--p99-slo-ms", type=float, default=None)
+    parser.add_argument("--output", default="results/loadtest.json")
+    return parser.parse_args(argv)
+
+
+def _target(url: str | None):
+    if url:
+        return HttpTarget(url)
+    # A aplicação só é importada (e o modelo carregado) no modo em processo
+    from ..main import app
+
+    return AsgiTarget(app)
+
+
+async def run(args) -> dict:
+    started_at = datetime.now().isoformat(timespec="seconds")
+    target = _target(args.url)
+    workload = Workload(args.path, args.batch_size)
+    levels = [float(level) for level in args.levels.split(",")]
+
+    async def step(level, duration):
+        if args.mode == "closed":
+            return await closed_loop_step(
+                target, workload, int(level), duration, args.timeout
+            )
+        return await open_loop_step(
+            target, workload, level, duration, args.timeout, args.max_in_flight
+        )
+
+    try:
+        if args.warmup > 0:
+            await step(levels[0], args.warmup)
+
+        steps = []
+        for level in levels:
+            summary = (await step(level, args.duration)).summary()
+            logger.info(
+                f"{args.mode} {level:g}: {summary['throughput_rps']:.1f} req/s, "
+                f"p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms, "
+                f"erros {summary['error_rate']:.2%}"
+            )
+            steps.append(summary)
+    finally:
+        await target.close()
+
+    return {
+        "started_at": started_at,
+        "target": target.name,
+        "path": workload.path,
+        "batch_size": args.batch_size,
+        "mode": args.mode,
+        "duration_s": args.duration,
+        "steps": steps,
+        "saturation": find_saturation(
+            steps, max_error_rate=args.max_error_rate, p99_slo_ms=args.p99_slo_ms
+        ),
+    }
+
+
+def _print_results(results: dict):
+    print(
+        f"{'degrau':>8}{'req/s':>10}{'linhas/s':>11}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'p999 ms':>10}{'erros':>8}"
+    )
+    for step in results["steps"]:
+        latencies = "".join(
+            f"{step[key]:>10.2f}" if step[key] is not None else f"{'-':>10}"
+            for key in ("p50_ms", "p95_ms", "p99_ms", "p999_ms")
+        )
+        print(
+            f"{step['level']:>8g}{step['throughput_rps']:>10.1f}"
+            f"{step['rows_per_s']:>11.1f}{latencies}"
+            f"{step['error_rate']:>8.1%}"
+        )
+
+    saturation = results["saturation"]
+    if saturation["step"]:
+        print(
+            f"\nSaturação em {saturation['step']['level']:g} "
+            f"({saturation['step']['throughput_rps']:.1f} req/s): "
+            f"{saturation['reason']}"
+        )
+    else:
+        print(f"\nNenhum degrau saudável: {saturation['reason']}")
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    results = asyncio.run(run(args))
+    _print_results(results)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Resultados salvos em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
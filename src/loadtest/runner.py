@@ -0,0 +1,230 @@
+"""
+Execução do teste de carga em degraus
+
+- Malha fechada: `concorrência` clientes enviam uma requisição assim que a
+  anterior termina; mede a vazão máxima sustentada em cada concorrência
+- Malha aberta: as requisições chegam a uma taxa fixa, independentemente das
+  respostas; a latência é medida a partir do instante programado de chegada,
+  de modo que filas no servidor aparecem na latência (sem omissão coordenada)
+
+Cada degrau reporta vazão, latências p50/p95/p99/p999 e taxa de erro, e o
+ponto de saturação é o último degrau saudável antes de a vazão parar de
+crescer ou de os erros/latências passarem dos limites.
+"""
+
+import asyncio
+import json
+import random
+
+import numpy as np
+
+from .targets import TargetError
+
+PERCENTILES = {"p50_ms": 50, "p95_ms": 95, "p99_ms": 99, "p999_ms": 99.9}
+
+
+class Workload:
+    """Gera os corpos das requisições enviadas ao endpoint"""
+
+    def __init__(self, path: str | None = None, batch_size: int = 1, seed: int = 42):
+        """
+        Args:
+            path: Caminho do endpoint (padrão: `/api/v1/predict`, ou
+                `/api/v1/predict/batch` se `batch_size` > 1)
+            batch_size: Casas por requisição; acima de 1 o corpo é colunar
+            seed: Semente das casas geradas
+        """
+        self.batch_size = batch_size
+        self.path = path or (
+            "/api/v1/predict/batch" if batch_size > 1 else "/api/v1/predict"
+        )
+        self.rng = random.Random(seed)
+
+    def house(self) -> dict:
+        """Casa aleatória que respeita as regras de negócio"""
+        return {
+            "quartos": self.rng.randint(1, 5),
+            "tamanho": round(self.rng.uniform(30, 200), 1),
+            "banheiros": self.rng.randint(1, 4),
+        }
+
+    def body(self) -> bytes:
+        if self.batch_size == 1:
+            return json.dumps(self.house()).encode()
+        houses = [self.house() for _ in range(self.batch_size)]
+        return json.dumps(
+            {field: [house[field] for house in houses] for field in houses[0]}
+        ).encode()
+
+
+class StepResult:
+    """Latências e erros de um degrau"""
+
+    def __init__(self, mode: str, level: float, batch_size: int = 1):
+        self.mode = mode
+        self.level = level
+        self.batch_size = batch_size
+        self.latencies = []
+        self.errors = {}
+        self.elapsed = 0.0
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self) -> dict:
+        n_errors = sum(self.errors.values())
+        total = len(self.latencies) + n_errors
+        latencies_ms = np.asarray(self.latencies) * 1000
+        summary = {
+            "mode": self.mode,
+            "level": self.level,
+            "requests": total,
+            "ok": len(self.latencies),
+            "errors": self.errors,
+            "error_rate": n_errors / total if total else 0.0,
+            "duration_s": self.elapsed,
+            "throughput_rps": len(self.latencies) / self.elapsed if self.elapsed else 0,
+            "batch_size": self.batch_size,
+            "rows_per_s": (
+                len(self.latencies) * self.batch_size / self.elapsed
+                if self.elapsed
+                else 0
+            ),
+            "mean_ms": float(latencies_ms.mean()) if len(latencies_ms) else None,
+        }
+        for name, q in PERCENTILES.items():
+            summary[name] = (
+                float(np.percentile(latencies_ms, q)) if len(latencies_ms) else None
+            )
+        return summary
+
+
+async def _send(target, workload: Workload, timeout: float, result: StepResult, start):
+    """Envia uma requisição e registra a latência desde `start`"""
+    loop = asyncio.get_running_loop()
+    try:
+        status, _ = await asyncio.wait_for(
+            target.request("POST", workload.path, workload.body()), timeout
+        )
+    except TimeoutError:
+        result.error("timeout")
+        return
+    except TargetError:
+        result.error("transport")
+        return
+    if status != 200:
+        result.error(f"http_{status}")
+        return
+    result.latencies.append(loop.time() - start)
+
+
+async def closed_loop_step(
+    target, workload: Workload, concurrency: int, duration: float, timeout: float
+) -> StepResult:
+    """
+    Degrau de malha fechada com `concurrency` clientes durante `duration`
+    segundos
+    """
+    loop = asyncio.get_running_loop()
+    result = StepResult("closed", concurrency, workload.batch_size)
+    start = loop.time()
+    deadline = start + duration
+
+    async def client():
+        while loop.time() < deadline:
+            await _send(target, workload, timeout, result, loop.time())
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result.elapsed = loop.time() - start
+    return result
+
+
+async def open_loop_step(
+    target,
+    workload: Workload,
+    rate: float,
+    duration: float,
+    timeout: float,
+    max_in_flight: int = 10000,
+) -> StepResult:
+    """
+    Degrau de malha aberta com chegadas a `rate` requisições por segundo
+    durante `duration` segundos
+
+    Requisições que chegariam com `max_in_flight` já pendentes são contadas
+    como erro (`overflow`) em vez de acumular memória sem limite.
+    """
+    loop = asyncio.get_running_loop()
+    result = StepResult("open", rate, workload.batch_size)
+    pending = set()
+    start = loop.time()
+
+    for i in range(int(rate * duration)):
+        scheduled = start + i / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(pending) >= max_in_flight:
+            result.error("overflow")
+            continue
+        task = asyncio.create_task(_send(target, workload, timeout, result, scheduled))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending)
+    result.elapsed = loop.time() - start
+    return result
+
+
+def find_saturation(
+    steps: list[dict],
+    max_error_rate: float = 0.01,
+    p99_slo_ms: float | None = None,
+    min_gain: float = 0.05,
+) -> dict:
+    """
+    Ponto de saturação: o último degrau saudável antes da degradação
+
+    Um degrau degrada quando a taxa de erro passa de `max_error_rate`, quando
+    o p99 passa de `p99_slo_ms` ou quando a vazão deixa de acompanhar a carga
+    (em malha fechada, ganho menor que `min_gain` sobre o melhor degrau
+    anterior; em malha aberta, vazão abaixo de `1 - min_gain` da taxa
+    oferecida).
+
+    Returns:
+        Dicionário com o degrau de saturação, o degrau que degradou e o motivo
+    """
+    last_good = None
+    for step in steps:
+        reason = None
+        if step["error_rate"] > max_error_rate:
+            reason = f"taxa de erro {step['error_rate']:.2%}"
+        elif p99_slo_ms is not None and (step["p99_ms"] or 0) > p99_slo_ms:
+            reason = f"p99 de {step['p99_ms']:.1f} ms acima do SLO"
+        elif step["mode"] == "open" and step["throughput_rps"] < step["level"] * (
+            1 - min_gain
+        ):
+            reason = "vazão abaixo da taxa oferecida"
+        elif (
+            step["mode"] == "closed"
+            and last_good is not None
+            and step["throughput_rps"] < last_good["throughput_rps"] * (1 + min_gain)
+        ):
+            reason = "vazão parou de crescer com a concorrência"
+
+        if reason:
+            return {
+                "saturated": True,
+                "step": last_good,
+                "degraded": step,
+                "reason": reason,
+            }
+        last_good = step
+
+    return {
+        "saturated": False,
+        "step": last_good,
+        "degraded": None,
+        "reason": "saturação não atingida nos degraus testados",
+    }
@@ -0,0 +1,165 @@
+"""
+Alvos do teste de carga
+
+- `AsgiTarget`: chama a aplicação ASGI no próprio processo, sem rede
+- `HttpTarget`: cliente HTTP/1.1 assíncrono com conexões persistentes, para
+  um servidor já em execução (ex.: `make run-api`)
+"""
+
+import asyncio
+from urllib.parse import urlparse
+
+
+class TargetError(Exception):
+    """Falha de transporte ao enviar uma requisição"""
+
+
+class AsgiTarget:
+    """Envia requisições diretamente para uma aplicação ASGI"""
+
+    def __init__(self, app):
+        """
+        Args:
+            app: Aplicação ASGI (ex.: `src.main.app`)
+        """
+        self.app = app
+        self.name = "asgi"
+
+    async def request(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        """
+        Envia uma requisição
+
+        Returns:
+            Tuple com o status HTTP e o corpo da resposta
+        """
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"loadtest"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        request_sent = False
+        response_done = asyncio.Event()
+        status = None
+        chunks = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Depois do corpo, o cliente só "desconecta" ao fim da resposta
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        if status is None:
+            raise TargetError("A aplicação não enviou resposta")
+        return status, b"".join(chunks)
+
+    async def close(self):
+        pass
+
+
+class HttpTarget:
+    """Cliente HTTP/1.1 mínimo com um pool de conexões persistentes"""
+
+    def __init__(self, url: str):
+        """
+        Args:
+            url: URL base do servidor (ex.: `http://localhost:8000`)
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "http":
+            raise ValueError("Apenas URLs http:// são suportadas")
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.name = url
+        self._idle = []
+
+    async def _connection(self):
+        if self._idle:
+            return self._idle.pop()
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        """
+        Envia uma requisição, reaproveitando uma conexão livre do pool
+
+        Returns:
+            Tuple com o status HTTP e o corpo da resposta
+
+        Raises:
+            TargetError: Se a conexão falhar ou a resposta for inválida
+        """
+        reader, writer = await self._connection()
+        try:
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            status, keep_alive, payload = await self._read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            writer.close()
+            raise TargetError(str(e)) from e
+        except BaseException:
+            # Ex.: timeout no meio da resposta; a conexão não pode ser reusada
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, payload
+
+    @staticmethod
+    async def _read_response(reader) -> tuple[int, bool, bytes]:
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split(b" ", 2)[1])
+        headers = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readuntil(b"\r\n")).strip(), 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            await reader.readexactly(2)
+            payload = b"".join(chunks)
+        else:
+            payload = await reader.readexactly(int(headers.get("content-length", 0)))
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        return status, keep_alive, payload
+
+    async def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
@@ -9,21 +9,48 @@ Autor: Nasser Boan
 nasser.boan@vert.com.br
 """
 
+import os
 import time
+import uuid
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from loguru import logger
 
-from .api import router
+from config.settings import app_config
+
+from .api.routes import router
+from .core.registry import VERSION_PATTERN
+from .uds.server import start_server
+from .utils.profiler import RequestProfiler
 
 # Configuração do logger
 logger.add("logs/app.log", rotation="10 MB", retention="7 days", level="INFO")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicia o servidor de socket Unix no mesmo processo, se habilitado"""
+    if not app_config.uds_enabled:
+        yield
+        return
+
+    uds_server = await start_server(app_config.uds_socket_path)
+    try:
+        yield
+    finally:
+        uds_server.close()
+        await uds_server.wait_closed()
+        if os.path.exists(app_config.uds_socket_path):
+            os.unlink(app_config.uds_socket_path)
+
+
 # Criação da aplicação FastAPI
 app = FastAPI(
     title="API de predição de casas",
     version="1.0.0",
     description="API de predição de casas",
+    lifespan=lifespan,
 )
 
 
@@ -46,6 +73,49 @@ async def request_logging_middleware(request: Request, call_next):
     return response
 
 
+if app_config.profiling_enabled:
+    request_profiler = RequestProfiler(
+        output_dir=app_config.profiling_dir,
+        sample_rate=app_config.profiling_sample_rate,
+        admin_token=app_config.profiling_admin_token,
+        max_fraction=app_config.profiling_max_fraction,
+        admin_per_minute=app_config.profiling_admin_per_minute,
+        max_files=app_config.profiling_max_files,
+        interval=app_config.profiling_interval,
+    )
+
+    @app.middleware("http")
+    async def request_profiling_middleware(request: Request, call_next):
+        """Middleware de profiling sob demanda das requisições selecionadas"""
+        header_value = request.headers.get(app_config.profiling_header)
+        reason = request_profiler.should_profile(header_value)
+        if reason is None:
+            return await call_next(request)
+
+        request_id = uuid.uuid4().hex[:16]
+        session = request_profiler.start(request_id, reason)
+        if session is None:
+            return await call_next(request)
+
+        response = None
+        try:
+            response = await call_next(request)
+        finally:
+            # A versão servida vem da resposta (cabeçalho ou caminho da
+            # requisição); só entra no nome do arquivo se for válida
+            model_version = (
+                response.headers.get(app_config.model_version_header)
+                if response is not None
+                else None
+            )
+            if model_version and not VERSION_PATTERN.match(model_version):
+                model_version = None
+            request_profiler.finish(session, request.url.path, model_version)
+
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
 # Inclui as rotas da API
 app.include_router(router, prefix="/api/v1", tags=["api"])
 
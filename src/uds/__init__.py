@@ -0,0 +1,8 @@
+"""
+Módulo UDS - Interface de predição via socket Unix para processos locais
+"""
+
+from .client import HousePredictorClient
+from .protocol import PredictionError, ProtocolError
+
+__all__ = ["HousePredictorClient", "PredictionError", "ProtocolError"]
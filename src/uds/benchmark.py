@@ -0,0 +1,108 @@
+"""
+Benchmark de latência: socket Unix x HTTP
+
+Mede o tempo de ida e volta de predições de uma casa pelos dois caminhos,
+com conexões persistentes, e a vazão do socket Unix com pipelining. A API
+precisa estar rodando com o socket habilitado (`make run-uds`).
+
+Uso:
+    python -m src.uds.benchmark [--requests N] [--http-url URL] [--socket CAMINHO]
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import time
+from urllib.parse import urlparse
+
+from config.settings import app_config
+
+from .client import HousePredictorClient
+
+HOUSE = (3, 120.5, 2)
+
+
+def _summary(timings: list[float]) -> dict:
+    """Resumo das latências, em microssegundos"""
+    timings = sorted(timings)
+    return {
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p95_us": timings[int(len(timings) * 0.95)] * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+    }
+
+
+def bench_uds(socket_path: str, n_requests: int) -> dict:
+    with HousePredictorClient(socket_path) as client:
+        client.predict(*HOUSE)  # aquecimento
+
+        timings = []
+        for _ in range(n_requests):
+            start = time.perf_counter()
+            client.predict(*HOUSE)
+            timings.append(time.perf_counter() - start)
+
+        pipeline_depth = 32
+        start = time.perf_counter()
+        for _ in range(max(n_requests // pipeline_depth, 1)):
+            client.predict_pipelined([[HOUSE]] * pipeline_depth)
+        elapsed = time.perf_counter() - start
+
+    return {
+        **_summary(timings),
+        "pipelined_rps": max(n_requests // pipeline_depth, 1)
+        * pipeline_depth
+        / elapsed,
+    }
+
+
+def bench_http(url: str, n_requests: int) -> dict:
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80)
+    body = json.dumps(
+        dict(zip(("quartos", "tamanho", "banheiros"), HOUSE, strict=True))
+    )
+    headers = {"Content-Type": "application/json"}
+
+    def request():
+        connection.request("POST", parsed.path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+
+    request()  # aquecimento
+    timings = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        request()
+        timings.append(time.perf_counter() - start)
+    connection.close()
+
+    return _summary(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark socket Unix x HTTP")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--http-url", default="http://127.0.0.1:8000/api/v1/predict")
+    parser.add_argument("--socket", default=app_config.uds_socket_path)
+    args = parser.parse_args()
+
+    results = {"uds": bench_uds(args.socket, args.requests)}
+    try:
+        results["http"] = bench_http(args.http_url, args.requests)
+    except (OSError, RuntimeError) as e:
+        print(f"Não foi possível medir o caminho HTTP: {e}")
+
+    for name, result in results.items():
+        print(f"{name:>5}: " + ", ".join(f"{k}={v:,.1f}" for k, v in result.items()))
+    if "http" in results:
+        speedup = results["http"]["p50_us"] / results["uds"]["p50_us"]
+        print(f"Ganho na mediana do socket Unix sobre HTTP: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Cliente da interface de predição via socket Unix
+
+Exemplo:
+    with HousePredictorClient() as client:
+        client.predict(3, 120.5, 2)
+        client.predict_batch([(3, 120.5, 2), (2, 80.0, 1)])
+"""
+
+import itertools
+import socket
+
+from config.settings import app_config
+
+from .protocol import (
+    FRAME_HEADER,
+    PredictionError,
+    ProtocolError,
+    decode_response,
+    encode_request,
+)
+
+
+class HousePredictorClient:
+    """
+    Cliente síncrono com uma conexão persistente ao servidor de predição
+    """
+
+    def __init__(self, socket_path: str | None = None, timeout: float = 5.0):
+        """
+        Args:
+            socket_path: Caminho do socket do servidor
+            timeout: Timeout das operações no socket, em segundos
+        """
+        self.socket_path = socket_path or app_config.uds_socket_path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(self.socket_path)
+        self.reader = self.sock.makefile("rb")
+        self._request_ids = itertools.count()
+
+    def _next_request_id(self) -> int:
+        return next(self._request_ids) % 2**32
+
+    def _read_exactly(self, size: int) -> bytes:
+        data = self.reader.read(size)
+        if len(data) != size:
+            raise ProtocolError("Conexão encerrada pelo servidor")
+        return data
+
+    def _read_response(self) -> tuple[int, list[float]]:
+        (length,) = FRAME_HEADER.unpack(self._read_exactly(FRAME_HEADER.size))
+        return decode_response(self._read_exactly(length))
+
+    def predict_pipelined(
+        self, batches: list[list[tuple[int, float, int]]]
+    ) -> list[list[float]]:
+        """
+        Envia várias requisições sem esperar as respostas e as lê em seguida
+
+        Args:
+            batches: Lista de lotes; cada lote é uma lista de tuplas
+                (quartos, tamanho, banheiros)
+
+        Returns:
+            Predições de cada lote, na mesma ordem (-1 para casas que
+            violam as regras de negócio)
+
+        Raises:
+            PredictionError: Se o servidor rejeitar alguma requisição
+            ProtocolError: Se as respostas vierem fora de ordem
+
+        Todas as respostas do pipeline são lidas antes de qualquer erro ser
+        levantado, para que a conexão continue sincronizada.
+        """
+        request_ids = [self._next_request_id() for _ in batches]
+        self.sock.sendall(
+            b"".join(
+                encode_request(request_id, rows)
+                for request_id, rows in zip(request_ids, batches, strict=True)
+            )
+        )
+
+        results = []
+        errors = []
+        for expected_id in request_ids:
+            try:
+                request_id, predictions = self._read_response()
+            except PredictionError as e:
+                request_id, predictions = e.request_id, None
+                errors.append(e)
+            if request_id != expected_id:
+                errors.insert(0, ProtocolError("Resposta fora de ordem"))
+            results.append(predictions)
+
+        if errors:
+            raise errors[0]
+        return results
+
+    def predict_batch(self, rows: list[tuple[int, float, int]]) -> list[float]:
+        """Prediz um lote de casas em uma única requisição"""
+        return self.predict_pipelined([rows])[0]
+
+    def predict(self, quartos: int, tamanho: float, banheiros: int) -> float:
+        """Prediz o valor de uma casa"""
+        return self.predict_batch([(quartos, tamanho, banheiros)])[0]
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,122 @@
+"""
+Protocolo binário da interface de predição via socket Unix
+
+Todas as mensagens são frames com prefixo de tamanho:
+
+    [u32 tamanho do corpo][corpo]
+
+Corpo da requisição:
+
+    [u32 request_id][u16 n_linhas] + n_linhas x [i32 quartos][f64 tamanho][i32 banheiros]
+
+Corpo da resposta:
+
+    [u32 request_id][u8 status] +
+        status OK:   [u16 n_linhas] + n_linhas x [f64 predição]
+        status ERRO: mensagem de erro em UTF-8
+
+Inteiros e floats são little-endian. O cliente pode enviar várias
+requisições sem esperar as respostas (pipelining); as respostas voltam na
+mesma ordem, identificadas pelo `request_id`.
+"""
+
+import struct
+
+import numpy as np
+
+FRAME_HEADER = struct.Struct("<I")
+REQUEST_HEADER = struct.Struct("<IH")
+RESPONSE_HEADER = struct.Struct("<IB")
+ROWS_HEADER = struct.Struct("<H")
+ROW = struct.Struct("<idi")
+PREDICTION = struct.Struct("<d")
+# Mesmo layout de `ROW`, para ler as linhas de uma vez como colunas
+ROW_DTYPE = np.dtype([("quartos", "<i4"), ("tamanho", "<f8"), ("banheiros", "<i4")])
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MAX_ROWS = 2**16 - 1
+MAX_FRAME_SIZE = REQUEST_HEADER.size + MAX_ROWS * ROW.size
+
+
+class ProtocolError(Exception):
+    """Frame malformado ou inválido"""
+
+
+class PredictionError(Exception):
+    """Erro devolvido pelo servidor para uma requisição"""
+
+    def __init__(self, message: str, request_id: int | None = None):
+        super().__init__(message)
+        self.request_id = request_id
+
+
+def encode_frame(body: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def encode_request(request_id: int, rows: list[tuple[int, float, int]]) -> bytes:
+    """
+    Codifica uma requisição (já com o prefixo de tamanho)
+
+    Args:
+        request_id: Identificador da requisição
+        rows: Lista de tuplas (quartos, tamanho, banheiros)
+    """
+    if len(rows) > MAX_ROWS:
+        raise ProtocolError(f"No máximo {MAX_ROWS} linhas por requisição")
+    body = bytearray(REQUEST_HEADER.pack(request_id, len(rows)))
+    for row in rows:
+        body += ROW.pack(*row)
+    return encode_frame(bytes(body))
+
+
+def decode_request(body: bytes) -> tuple[int, np.ndarray]:
+    """
+    Decodifica o corpo de uma requisição
+
+    Returns:
+        Tuple com o `request_id` e um array estruturado com um campo por
+        coluna (`ROW_DTYPE`)
+    """
+    if len(body) < REQUEST_HEADER.size:
+        raise ProtocolError("Requisição menor que o cabeçalho")
+    request_id, n_rows = REQUEST_HEADER.unpack_from(body)
+    if len(body) != REQUEST_HEADER.size + n_rows * ROW.size:
+        raise ProtocolError("Tamanho da requisição não corresponde ao número de linhas")
+    return request_id, np.frombuffer(body, dtype=ROW_DTYPE, offset=REQUEST_HEADER.size)
+
+
+def encode_response(request_id: int, predictions: list[float]) -> bytes:
+    """Codifica uma resposta de sucesso (já com o prefixo de tamanho)"""
+    body = (
+        RESPONSE_HEADER.pack(request_id, STATUS_OK)
+        + ROWS_HEADER.pack(len(predictions))
+        + struct.pack(f"<{len(predictions)}d", *predictions)
+    )
+    return encode_frame(body)
+
+
+def encode_error(request_id: int, message: str) -> bytes:
+    """Codifica uma resposta de erro (já com o prefixo de tamanho)"""
+    return encode_frame(
+        RESPONSE_HEADER.pack(request_id, STATUS_ERROR) + message.encode("utf-8")
+    )
+
+
+def decode_response(body: bytes) -> tuple[int, list[float]]:
+    """
+    Decodifica o corpo de uma resposta
+
+    Raises:
+        PredictionError: Se o servidor devolveu um erro para a requisição
+    """
+    request_id, status = RESPONSE_HEADER.unpack_from(body)
+    payload = body[RESPONSE_HEADER.size :]
+    if status == STATUS_ERROR:
+        raise PredictionError(payload.decode("utf-8"), request_id)
+    (n_rows,) = ROWS_HEADER.unpack_from(payload)
+    return request_id, list(
+        struct.unpack_from(f"<{n_rows}d", payload, ROWS_HEADER.size)
+    )
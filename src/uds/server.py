@@ -0,0 +1,172 @@
+"""
+Servidor de predição via socket Unix
+
+Expõe o mesmo `HousePredictorApp` (modelo, scaler e regras de negócio) da
+API HTTP para processos da mesma máquina, usando o protocolo binário de
+`protocol.py`, sem o custo de HTTP/JSON e do roteamento do FastAPI.
+
+O servidor roda dentro do processo da API (ver `lifespan` em `src/main.py`,
+ligado por `UDS_ENABLED`): as duas interfaces compartilham o modelo
+carregado, as estatísticas de `/stats` e a avaliação em sombra de `/shadow`.
+
+Todas as requisições completas que chegam juntas em uma conexão (pipelining)
+são validadas e preditas em um único lote.
+"""
+
+import asyncio
+import os
+
+import numpy as np
+from loguru import logger
+
+from ..api.validation import BulkValidator
+from ..core import HousePredictorApp, get_house_predictor
+from ..core.shadow import ShadowScorer, get_shadow_scorer
+from .protocol import (
+    FRAME_HEADER,
+    MAX_FRAME_SIZE,
+    ProtocolError,
+    decode_request,
+    encode_error,
+    encode_response,
+)
+
+
+class PredictionProtocol(asyncio.Protocol):
+    """
+    Protocolo asyncio de uma conexão com o servidor de predição
+
+    A validação e a predição rodam no executor padrão do event loop, para não
+    bloquear as requisições HTTP servidas pelo mesmo loop. Enquanto um lote é
+    predito, novas requisições se acumulam no buffer e formam o próximo lote;
+    as respostas de uma conexão saem na ordem das requisições.
+    """
+
+    def __init__(
+        self, predictor: HousePredictorApp, shadow_scorer: ShadowScorer | None = None
+    ):
+        self.predictor = predictor
+        self.shadow_scorer = shadow_scorer
+        self.validator = BulkValidator()
+        self.buffer = bytearray()
+        self.transport = None
+        self._task = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._serve())
+
+    async def _serve(self):
+        """Prediz os lotes acumulados até o buffer ficar sem requisições"""
+        loop = asyncio.get_running_loop()
+        try:
+            while self.transport is not None:
+                try:
+                    requests = self._read_requests()
+                except ProtocolError as e:
+                    logger.error(f"Erro de protocolo, encerrando conexão: {e}")
+                    self.transport.close()
+                    return
+                if not requests:
+                    return
+                response = await loop.run_in_executor(None, self._handle, requests)
+                if self.transport is not None:
+                    self.transport.write(response)
+        finally:
+            self._task = None
+
+    def _read_requests(self) -> list[tuple[int, np.ndarray]]:
+        """Extrai do buffer todas as requisições completas"""
+        requests = []
+        while len(self.buffer) >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer)
+            if length > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Frame de {length} bytes excede o limite")
+            end = FRAME_HEADER.size + length
+            if len(self.buffer) < end:
+                break
+            requests.append(decode_request(bytes(self.buffer[FRAME_HEADER.size : end])))
+            del self.buffer[:end]
+        return requests
+
+    def _handle(self, requests: list[tuple[int, np.ndarray]]) -> bytes:
+        """
+        Valida as requisições e prediz todas as linhas válidas em um lote
+        """
+        responses = [b""] * len(requests)
+        batch = []
+        batch_slices = []
+        n_rows = 0
+        for index, (request_id, rows) in enumerate(requests):
+            columns = {name: rows[name] for name in rows.dtype.names}
+            features, errors = self.validator.validate(columns, loc=())
+            if errors:
+                responses[index] = encode_error(request_id, _format_errors(errors))
+                continue
+            batch_slices.append((index, request_id, n_rows, n_rows + len(features)))
+            batch.append(features)
+            n_rows += len(features)
+
+        if batch:
+            features = np.concatenate(batch)
+            try:
+                predictions = self.predictor.predict_batch(features)
+            except Exception as e:
+                logger.error(f"Erro ao fazer predição: {e}")
+                for index, request_id, _, _ in batch_slices:
+                    responses[index] = encode_error(request_id, "Erro interno")
+            else:
+                if self.shadow_scorer:
+                    self.shadow_scorer.submit(features, predictions)
+                predictions = predictions.tolist()
+                for index, request_id, start, end in batch_slices:
+                    responses[index] = encode_response(
+                        request_id, predictions[start:end]
+                    )
+
+        return b"".join(responses)
+
+
+def _format_errors(errors: list[dict]) -> str:
+    """Mensagem de erro no estilo do `ValidationError` do Pydantic"""
+    lines = [f"{len(errors)} erro(s) de validação"]
+    for error in errors:
+        loc = ".".join(str(part) for part in error["loc"])
+        lines.append(f"{loc}\n  {error['msg']} [type={error['type']}]")
+    return "\n".join(lines)
+
+
+async def start_server(
+    socket_path: str, predictor: HousePredictorApp | None = None
+) -> asyncio.AbstractServer:
+    """
+    Inicia o servidor no caminho de socket informado, no event loop atual
+
+    Args:
+        socket_path: Caminho do socket Unix (um arquivo existente é removido)
+        predictor: Modelo servido (padrão: `get_house_predictor()`)
+
+    Returns:
+        Servidor já escutando; fechá-lo encerra o socket
+    """
+    predictor = predictor or get_house_predictor()
+    shadow_scorer = get_shadow_scorer()
+    if shadow_scorer and shadow_scorer.candidate_version == predictor.model_date:
+        shadow_scorer = None
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    loop = asyncio.get_running_loop()
+    server = await loop.create_unix_server(
+        lambda: PredictionProtocol(predictor, shadow_scorer), path=socket_path
+    )
+    os.chmod(socket_path, 0o660)
+    logger.info(f"Servidor de predição escutando em {socket_path}")
+    return server
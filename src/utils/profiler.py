@@ -0,0 +1,275 @@
+"""
+Profiling sob demanda de requisições
+
+Um profiler por amostragem (thread que lê periodicamente a pilha de chamadas
+das threads da requisição) grava perfis no formato "folded stacks", que pode
+ser aberto diretamente no speedscope ou no flamegraph.pl.
+
+Só é ativado quando `AppConfig.profiling_enabled` é verdadeiro; caso
+contrário o middleware nem é registrado e o custo é nulo.
+"""
+
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+from loguru import logger
+
+_current_session: ContextVar["ProfileSession | None"] = ContextVar(
+    "profile_session", default=None
+)
+
+
+class ProfileSession:
+    """
+    Sessão de profiling de uma única requisição.
+
+    Uma thread auxiliar amostra a pilha de chamadas das threads registradas
+    (a thread do event loop e a thread do threadpool que executa a rota).
+    """
+
+    def __init__(self, request_id: str, interval: float):
+        """
+        Args:
+            request_id: Identificador da requisição
+            interval: Intervalo entre amostras, em segundos
+        """
+        self.request_id = request_id
+        # Só é conhecida depois que a rota responde (ver `RequestProfiler.finish`)
+        self.model_version = "unknown"
+        self.interval = interval
+        self.thread_ids = {threading.get_ident()}
+        self.stacks = Counter()
+        self.n_samples = 0
+        self.token = None
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="request-profiler", daemon=True
+        )
+
+    def attach_current_thread(self):
+        """Inclui a thread atual na amostragem"""
+        self.thread_ids.add(threading.get_ident())
+
+    def start(self):
+        """Inicia a amostragem"""
+        self.started_at = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self):
+        """Encerra a amostragem"""
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[_fold_stack(frame)] += 1
+            self.n_samples += 1
+
+    def to_folded(self) -> str:
+        """Serializa as pilhas amostradas no formato folded"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def _fold_stack(frame) -> str:
+    """Converte uma pilha de frames em uma linha `raiz;...;folha`"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def attach_current_thread():
+    """
+    Inclui a thread atual na sessão de profiling da requisição, se houver.
+
+    Deve ser chamada no início das rotas síncronas, que o FastAPI executa em
+    uma thread do threadpool diferente da thread do middleware.
+    """
+    session = _current_session.get()
+    if session is not None:
+        session.attach_current_thread()
+
+
+class RequestProfiler:
+    """
+    Decide quais requisições serão perfiladas e grava os perfis em disco.
+
+    Uma requisição é perfilada quando traz o header de administração com o
+    token correto ou quando é sorteada pela taxa de amostragem, e apenas uma
+    requisição é perfilada por vez.
+
+    As duas origens têm cotas separadas:
+    - sorteio: cada requisição acumula `max_fraction` de crédito (até 1) e
+      cada perfil consome um crédito inteiro, então a fração perfilada nunca
+      passa de `max_fraction`; o primeiro crédito já está disponível
+    - administração: até `admin_per_minute` perfis por minuto, repostos com o
+      tempo, para funcionar mesmo em instâncias com pouco tráfego
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        sample_rate: float = 0.0,
+        admin_token: str | None = None,
+        max_fraction: float = 0.01,
+        admin_per_minute: float = 6.0,
+        max_files: int = 100,
+        interval: float = 0.001,
+    ):
+        """
+        Args:
+            output_dir: Diretório onde os perfis são gravados
+            sample_rate: Fração das requisições sorteadas para profiling
+            admin_token: Token aceito no header de administração
+            max_fraction: Fração máxima do tráfego perfilada por sorteio
+            admin_per_minute: Máximo de perfis por minuto pedidos com o token
+            max_files: Quantidade máxima de perfis mantidos no diretório
+            interval: Intervalo entre amostras, em segundos
+        """
+        self.output_dir = Path(output_dir)
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token
+        self.max_fraction = max_fraction
+        self.admin_per_minute = admin_per_minute
+        self.max_files = max_files
+        self.interval = interval
+        self.n_requests = 0
+        self.n_profiled = 0
+        self._sample_credit = 1.0
+        self._admin_capacity = max(admin_per_minute, 1.0)
+        self._admin_credit = self._admin_capacity
+        self._admin_refilled_at = time.monotonic()
+        self._busy = threading.Lock()
+        self._counter_lock = threading.Lock()
+
+    def _is_admin_request(self, header_value: str | None) -> bool:
+        if not self.admin_token or not header_value:
+            return False
+        return hmac.compare_digest(header_value, self.admin_token)
+
+    def _refill_admin(self):
+        now = time.monotonic()
+        self._admin_credit = min(
+            self._admin_capacity,
+            self._admin_credit
+            + (now - self._admin_refilled_at) * self.admin_per_minute / 60,
+        )
+        self._admin_refilled_at = now
+
+    def should_profile(self, header_value: str | None) -> str | None:
+        """
+        Decide se a requisição atual será perfilada, sem consumir a cota
+
+        Args:
+            header_value: Valor do header de administração (ou None)
+
+        Returns:
+            "admin" ou "sample", conforme a origem, ou None
+        """
+        with self._counter_lock:
+            self.n_requests += 1
+            self._sample_credit = min(1.0, self._sample_credit + self.max_fraction)
+            if self._is_admin_request(header_value):
+                self._refill_admin()
+                if self._admin_credit >= 1:
+                    return "admin"
+            if (
+                self.sample_rate > 0
+                and self._sample_credit >= 1
+                and random.random() < self.sample_rate
+            ):
+                return "sample"
+            return None
+
+    def start(self, request_id: str, reason: str = "sample") -> ProfileSession | None:
+        """
+        Inicia uma sessão de profiling, se nenhuma outra estiver em andamento
+        e a cota de `reason` permitir; só uma sessão iniciada consome a cota
+        """
+        if not self._busy.acquire(blocking=False):
+            return None
+        with self._counter_lock:
+            if reason == "admin":
+                self._refill_admin()
+                allowed = self._admin_credit >= 1
+                if allowed:
+                    self._admin_credit -= 1
+            else:
+                allowed = self._sample_credit >= 1
+                if allowed:
+                    self._sample_credit -= 1
+            if allowed:
+                self.n_profiled += 1
+        if not allowed:
+            self._busy.release()
+            return None
+
+        session = ProfileSession(request_id, self.interval)
+        session.token = _current_session.set(session)
+        session.start()
+        return session
+
+    def finish(
+        self, session: ProfileSession, path: str, model_version: str | None = None
+    ) -> Path | None:
+        """
+        Encerra a sessão e grava o perfil no diretório de saída
+
+        Args:
+            session: Sessão retornada por `start`
+            path: Caminho da requisição perfilada
+            model_version: Versão do modelo que serviu a requisição, já
+                validada (None se desconhecida)
+        """
+        if model_version:
+            session.model_version = model_version
+        try:
+            session.stop()
+            _current_session.reset(session.token)
+            return self._write(session, path)
+        except OSError as e:
+            logger.error(f"Erro ao salvar perfil da requisição: {e}")
+            return None
+        finally:
+            self._busy.release()
+
+    def _write(self, session: ProfileSession, path: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        route = path.strip("/").replace("/", "_") or "root"
+        file_path = self.output_dir / (
+            f"{time.strftime('%Y%m%d-%H%M%S')}_{session.request_id}"
+            f"_model-{session.model_version}_{route}.folded"
+        )
+        file_path.write_text(session.to_folded())
+        logger.info(
+            f"Perfil da requisição {session.request_id} salvo em {file_path} "
+            f"({session.n_samples} amostras em {session.duration:.3f}s)"
+        )
+        self._enforce_max_files()
+        return file_path
+
+    def _enforce_max_files(self):
+        """Remove os perfis mais antigos além do limite configurado"""
+        profiles = sorted(
+            self.output_dir.glob("*.folded"), key=lambda p: p.stat().st_mtime
+        )
+        for old_profile in profiles[: max(len(profiles) - self.max_files, 0)]:
+            old_profile.unlink(missing_ok=True)
@@ -0,0 +1,81 @@
+"""
+Equivalência entre as regras compiladas e a aplicação regra a regra
+"""
+
+import numpy as np
+import pytest
+
+from src.api.models import PredictionRequest
+from src.core.business import (
+    BanheirosRule,
+    BusinessRuleStrategy,
+    CompiledRuleSet,
+    HouseBusinessLogic,
+    PredicateRule,
+    QuartosRule,
+    TamanhoRule,
+    ThresholdRule,
+)
+
+FEATURES = ["quartos", "tamanho", "banheiros"]
+
+
+def _rules():
+    return [
+        QuartosRule(),
+        TamanhoRule(),
+        BanheirosRule(),
+        ThresholdRule("tamanho", 30, "<"),
+        ThresholdRule("quartos", 3, "=="),
+        ThresholdRule("banheiros", 2, "<="),
+        PredicateRule(
+            "banheiros > quartos",
+            lambda columns: columns["banheiros"] > columns["quartos"],
+        ),
+    ]
+
+
+def _houses(n: int = 500) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.column_stack(
+        [
+            rng.integers(1, 11, n),
+            rng.uniform(1, 1000, n).round(1),
+            rng.integers(1, 11, n),
+        ]
+    ).astype(np.float64)
+
+
+def test_violations_match_apply():
+    rules = _rules()
+    logic = HouseBusinessLogic()
+    for rule in rules:
+        logic.add_rule(rule)
+    rule_set = logic.compile(FEATURES)
+
+    features = _houses()
+    mask = rule_set.violations(features)
+    for row, row_mask in zip(features, mask, strict=True):
+        request = PredictionRequest(
+            quartos=int(row[0]), tamanho=row[1], banheiros=int(row[2])
+        )
+        expected = logic.apply_rules(request)
+        assert rule_set.accepts(request) == (not any(expected))
+        violated = [bool(int(row_mask) >> bit & 1) for bit in range(len(rules))]
+        assert violated == expected
+        assert rule_set.describe(row_mask) == [
+            rule.name
+            for rule, violated in zip(rules, expected, strict=True)
+            if violated
+        ]
+
+    np.testing.assert_array_equal(rule_set.allowed(features), mask == 0)
+
+
+def test_rejects_rules_that_cannot_be_compiled():
+    class LegacyRule(BusinessRuleStrategy):
+        def apply(self, data):
+            return False
+
+    with pytest.raises(TypeError):
+        CompiledRuleSet([LegacyRule()], FEATURES)
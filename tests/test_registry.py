@@ -0,0 +1,89 @@
+"""
+Carga sob demanda e despejo do registro de versões do modelo
+"""
+
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from config.settings import app_config
+from src.core.registry import ModelRegistry, ModelVersionNotFoundError
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def models_path(tmp_path, monkeypatch):
+    """Versões v1, v2 e v3 com artefatos de 1 MB cada (scaler + modelo)"""
+    monkeypatch.setattr(app_config, "models_path", str(tmp_path))
+    monkeypatch.setattr(app_config, "serve_surrogate", False)
+    for version in ("v1", "v2", "v3"):
+        model_dir = tmp_path / version / app_config.model_name
+        model_dir.mkdir(parents=True)
+        (tmp_path / version / "scaler.pkl").write_bytes(b"\0" * (MB // 2))
+        (model_dir / "model.pkl").write_bytes(b"\0" * (MB // 2))
+    # Pasta de versão sem modelo para servir
+    (tmp_path / "incompleta").mkdir()
+    return str(tmp_path)
+
+
+class CountingLoader:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.loads = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, version: str):
+        with self._lock:
+            self.loads[version] += 1
+        time.sleep(self.delay)
+        return f"predictor-{version}"
+
+
+def test_concurrent_requests_share_a_single_load(models_path):
+    loader = CountingLoader(delay=0.2)
+    registry = ModelRegistry(models_path, "v1", budget_mb=10, loader=loader)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("v2")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["predictor-v2"] * 8
+    assert loader.loads == {"v2": 1}
+    assert registry.get() == "predictor-v1"
+    assert registry.stats()["versions"]["v2"]["loads"] == 1
+
+
+def test_least_recently_used_version_is_evicted(models_path):
+    loader = CountingLoader()
+    registry = ModelRegistry(models_path, "v1", budget_mb=2, loader=loader)
+
+    registry.get("v1")
+    registry.get("v2")
+    registry.get("v1")  # v2 passa a ser a menos usada
+    registry.get("v3")
+
+    stats = registry.stats()
+    assert stats["resident"] == ["v1", "v3"]
+    assert stats["versions"]["v2"]["evictions"] == 1
+    assert stats["resident_bytes"] <= 2 * MB
+
+    registry.get("v2")
+    assert loader.loads["v2"] == 2
+
+
+def test_unknown_or_incomplete_versions_are_not_found(models_path):
+    registry = ModelRegistry(models_path, "v1", budget_mb=10, loader=CountingLoader())
+
+    for version in ("v9", "incompleta", "../v1"):
+        with pytest.raises(ModelVersionNotFoundError):
+            registry.get(version)
+    assert registry.available_versions() == ["v1", "v2", "v3"]
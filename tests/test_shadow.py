@@ -0,0 +1,114 @@
+"""
+Fila limitada e estatísticas da avaliação em sombra
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.core.shadow import ShadowScorer
+
+
+class BlockingPredictor:
+    """Prediz 10% acima do servido, esperando `release` a cada lote"""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.batches = []
+
+    def predict_batch(self, features, record_stats=True):
+        self.entered.set()
+        self.release.wait(timeout=5)
+        self.batches.append(features.copy())
+        return features[:, 1] * 11
+
+
+class CountingLoader:
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.loads = []
+
+    def __call__(self, version):
+        self.loads.append(version)
+        return self.predictor
+
+
+def _rows(n: int, start: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    tamanho = np.arange(start, start + n, dtype=np.float64) + 10
+    features = np.column_stack([np.ones(n), tamanho, np.ones(n)])
+    return features, tamanho * 10
+
+
+def _wait_scored(scorer: ShadowScorer, n_rows: int):
+    deadline = time.monotonic() + 5
+    while scorer.report()["n_scored"] + scorer.report()["n_errors"] < n_rows:
+        assert time.monotonic() < deadline, "sombra não processou as linhas"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def predictor():
+    predictor = BlockingPredictor()
+    yield predictor
+    predictor.release.set()
+
+
+def test_queue_is_bounded_in_rows_and_drops_when_full(predictor):
+    scorer = ShadowScorer(
+        "candidato", queue_rows=5, batch_size=256, loader=CountingLoader(predictor)
+    )
+    # O primeiro lote ocupa a thread da sombra, que fica parada na predição
+    scorer.submit(*_rows(1))
+    assert predictor.entered.wait(timeout=5)
+
+    # Com a sombra parada, os envios retornam sem esperar e só o que cabe
+    # nas 5 linhas da fila entra
+    scorer.submit(*_rows(3, start=100))
+    scorer.submit(*_rows(4, start=200))
+    scorer.submit(*_rows(1, start=300))
+    report = scorer.report()
+    assert report["n_submitted"] == 9
+    assert report["n_dropped"] == 3
+    assert report["queued_rows"] == 5
+
+    predictor.release.set()
+    _wait_scored(scorer, 6)
+    report = scorer.report()
+    assert report["n_scored"] == 6
+    assert report["queued_rows"] == 0
+    # De um envio que não cabe inteiro, entram as primeiras linhas
+    scored = np.concatenate(predictor.batches)[:, 1]
+    np.testing.assert_array_equal(scored, [10, 110, 111, 112, 210, 211])
+
+
+def test_agreement_stats_and_single_candidate_load(predictor):
+    predictor.release.set()
+    loader = CountingLoader(predictor)
+    scorer = ShadowScorer("candidato", batch_size=8, loader=loader)
+    for start in range(0, 100, 10):
+        scorer.submit(*_rows(10, start=start))
+    _wait_scored(scorer, 100)
+
+    report = scorer.report()
+    assert loader.loads == ["candidato"]
+    assert report["n_scored"] == 100
+    assert report["n_rejected"] == 0
+    relative = report["relative_abs_delta"]["quantiles"]
+    assert all(value == pytest.approx(0.1, rel=0.01) for value in relative.values())
+    expected = np.mean((np.arange(100) + 10) * 1.0)
+    assert report["mean_absolute_difference"] == pytest.approx(expected)
+
+
+def test_candidate_errors_are_counted():
+    def failing_loader(version):
+        raise FileNotFoundError(version)
+
+    scorer = ShadowScorer("inexistente", loader=failing_loader)
+    scorer.submit(*_rows(3))
+    _wait_scored(scorer, 3)
+    report = scorer.report()
+    assert report["n_errors"] == 3
+    assert report["n_scored"] == 0
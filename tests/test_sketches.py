@@ -0,0 +1,179 @@
+"""
+Precisão, combinação e atualização em lote dos resumos em streaming
+"""
+
+import numpy as np
+import pytest
+
+from src.core.monitoring import (
+    QuantileSketch,
+    RunningMoments,
+    ServingStats,
+    ValueCounter,
+)
+
+QUANTILES = np.linspace(0, 1, 101)
+
+
+def _values(n: int = 20000, seed: int = 0) -> np.ndarray:
+    """Valores de várias magnitudes, com sinal, zeros e valores minúsculos"""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=3, sigma=2, size=n)
+    values[rng.random(n) < 0.3] *= -1
+    values[rng.random(n) < 0.02] = 0.0
+    values[rng.random(n) < 0.01] = 1e-12
+    return values
+
+
+def _sketch(values, **kwargs) -> QuantileSketch:
+    sketch = QuantileSketch(**kwargs)
+    for value in values.tolist():
+        sketch.add(value)
+    return sketch
+
+
+def _state(sketch: QuantileSketch) -> tuple:
+    return sketch.count, sketch.zero_count, sketch.positive, sketch.negative
+
+
+def _assert_relative_error(sketch: QuantileSketch, values: np.ndarray):
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        expected = ordered[int(q * (len(values) - 1))]
+        if abs(expected) <= sketch.min_value:
+            expected = 0.0
+        estimate = sketch.quantile(q)
+        assert abs(estimate - expected) <= (
+            sketch.relative_accuracy * abs(expected) * (1 + 1e-9)
+        ), f"quantil {q}: {estimate} x {expected}"
+
+
+@pytest.mark.parametrize("relative_accuracy", [0.01, 0.05])
+def test_quantiles_within_relative_accuracy(relative_accuracy):
+    values = _values()
+    sketch = _sketch(values, relative_accuracy=relative_accuracy)
+    assert sketch.count == len(values)
+    _assert_relative_error(sketch, values)
+
+
+def test_collapse_keeps_accuracy_of_large_values():
+    values = np.abs(_values()) + 1
+    sketch = _sketch(values, max_buckets=400)
+    assert len(sketch.positive) == 400
+
+    ordered = np.sort(values)
+    # Os buckets agrupados são os de menor índice: os quantis altos mantêm a
+    # precisão
+    for q in (0.9, 0.99, 1.0):
+        expected = ordered[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected * (1 + 1e-9)
+
+
+def test_quantile_of_empty_sketch():
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merge_equals_single_sketch():
+    values = _values()
+    left, right = values[:7000], values[7000:]
+    merged = _sketch(left).merge(_sketch(right))
+    assert _state(merged) == _state(_sketch(values))
+
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=0.01).merge(
+            QuantileSketch(relative_accuracy=0.02)
+        )
+
+
+def test_add_many_equals_repeated_add():
+    values = _values()
+    batched = QuantileSketch()
+    for chunk in np.array_split(values, 7):
+        batched.add_many(chunk)
+    assert _state(batched) == _state(_sketch(values))
+
+    small = QuantileSketch(max_buckets=32)
+    small.add_many(values)
+    assert _state(small) == _state(_sketch(values, max_buckets=32))
+
+
+def test_running_moments_merge_and_add_many():
+    values = _values()
+    one_by_one = RunningMoments()
+    for value in values.tolist():
+        one_by_one.add(value)
+    merged = RunningMoments()
+    for chunk in np.array_split(values, 5):
+        part = RunningMoments()
+        for value in chunk.tolist():
+            part.add(value)
+        merged.merge(part)
+    batched = RunningMoments()
+    for chunk in np.array_split(values, 5):
+        batched.add_many(chunk)
+    batched.add_many(np.array([]))
+
+    for moments in (one_by_one, merged, batched):
+        assert moments.count == len(values)
+        assert moments.mean == pytest.approx(values.mean(), rel=1e-9)
+        assert moments.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+        assert moments.min == values.min()
+        assert moments.max == values.max()
+
+
+def test_value_counter_merge_and_add_many():
+    rng = np.random.default_rng(1)
+    values = rng.integers(-2, 15, 5000)
+
+    one_by_one = ValueCounter(max_value=10)
+    for value in values.tolist():
+        one_by_one.add(value)
+    batched = ValueCounter(max_value=10)
+    merged = ValueCounter(max_value=10)
+    for chunk in np.array_split(values, 3):
+        batched.add_many(chunk)
+        part = ValueCounter(max_value=10)
+        part.add_many(chunk)
+        merged.merge(part)
+
+    in_range = (values >= 0) & (values <= 10)
+    for counter in (one_by_one, batched, merged):
+        assert counter.counts == np.bincount(values[in_range], minlength=11).tolist()
+        assert counter.other == int((~in_range).sum())
+        assert counter.count == len(values)
+
+
+def test_observe_batch_equals_observe():
+    rng = np.random.default_rng(2)
+    n = 2000
+    features = np.column_stack(
+        [
+            rng.integers(1, 13, n),
+            rng.uniform(10, 400, n).round(1),
+            rng.integers(1, 6, n),
+        ]
+    ).astype(np.float64)
+    predictions = rng.uniform(100, 5000, n)
+    accepted = features[:, 0] <= 5
+
+    one_by_one = ServingStats()
+    for row, prediction, ok in zip(features, predictions, accepted, strict=True):
+        one_by_one.observe(
+            int(row[0]), float(row[1]), int(row[2]), float(prediction) if ok else None
+        )
+    batched = ServingStats()
+    for chunk in np.array_split(np.arange(n), 4):
+        batched.observe_batch(features[chunk], predictions[chunk], accepted[chunk])
+
+    expected, summary = one_by_one.summary(), batched.summary()
+    assert summary["n_requests"] == expected["n_requests"] == n
+    assert summary["n_rejected"] == expected["n_rejected"]
+    for name in ("quartos", "banheiros"):
+        assert summary["features"][name] == expected["features"][name]
+    for got, want in (
+        (summary["features"]["tamanho"], expected["features"]["tamanho"]),
+        (summary["prediction"], expected["prediction"]),
+    ):
+        assert got["quantiles"] == want["quantiles"]
+        for key in ("count", "mean", "std", "min", "max"):
+            assert got[key] == pytest.approx(want[key], rel=1e-9)
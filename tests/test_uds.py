@@ -0,0 +1,105 @@
+"""
+Protocolo binário e servidor de predição via socket Unix
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.uds import HousePredictorClient, PredictionError
+from src.uds.protocol import (
+    FRAME_HEADER,
+    decode_request,
+    decode_response,
+    encode_error,
+    encode_request,
+    encode_response,
+)
+from src.uds.server import start_server
+
+
+class FakePredictor:
+    """Prediz `tamanho * 10 + quartos`, com -1 para mais de 5 quartos"""
+
+    model_date = "test"
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        self.batch_sizes.append(len(features))
+        predictions = features[:, 1] * 10 + features[:, 0]
+        return np.where(features[:, 0] > 5, -1.0, predictions)
+
+
+def _expected(rows):
+    return [-1.0 if q > 5 else t * 10 + q for q, t, _ in rows]
+
+
+@pytest.fixture
+def predictor():
+    return FakePredictor()
+
+
+@pytest.fixture
+def socket_path(tmp_path, predictor):
+    path = str(tmp_path / "predicao.sock")
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(start_server(path, predictor))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield path
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def test_request_round_trip():
+    rows = [(3, 120.5, 2), (1, 30.0, 1)]
+    frame = encode_request(7, rows)
+    (length,) = FRAME_HEADER.unpack_from(frame)
+    assert length == len(frame) - FRAME_HEADER.size
+
+    request_id, decoded = decode_request(frame[FRAME_HEADER.size :])
+    assert request_id == 7
+    assert [tuple(row) for row in decoded.tolist()] == rows
+
+
+def test_response_round_trip():
+    frame = encode_response(9, [1.5, -1.0])
+    assert decode_response(frame[FRAME_HEADER.size :]) == (9, [1.5, -1.0])
+
+    frame = encode_error(11, "falhou")
+    with pytest.raises(PredictionError, match="falhou") as error:
+        decode_response(frame[FRAME_HEADER.size :])
+    assert error.value.request_id == 11
+
+
+def test_predict_over_socket(socket_path):
+    rows = [(3, 120.5, 2), (6, 80.0, 1), (2, 45.0, 1)]
+    with HousePredictorClient(socket_path) as client:
+        assert client.predict(3, 120.5, 2) == 1208.0
+        assert client.predict_batch(rows) == _expected(rows)
+
+
+def test_pipelined_requests(socket_path, predictor):
+    batches = [[(1, float(i), 1)] * (i + 1) for i in range(1, 20)]
+    with HousePredictorClient(socket_path) as client:
+        results = client.predict_pipelined(batches)
+    assert results == [_expected(rows) for rows in batches]
+    # Requisições que chegam juntas são preditas juntas, sem perder linhas
+    assert len(predictor.batch_sizes) <= len(batches)
+    assert sum(predictor.batch_sizes) == sum(len(rows) for rows in batches)
+
+
+def test_rejected_request_keeps_connection_in_sync(socket_path):
+    ok = [(2, 50.0, 1)]
+    with HousePredictorClient(socket_path) as client:
+        with pytest.raises(PredictionError, match="quartos") as error:
+            client.predict_pipelined([ok, [(0, 1.0, 1)], ok])
+        assert "type=greater_than" in str(error.value)
+        assert client.predict(2, 50.0, 1) == _expected(ok)[0]
@@ -0,0 +1,137 @@
+"""
+Paridade entre a validação em lote e o `PredictionRequest`
+"""
+
+import math
+
+import numpy as np
+import pytest
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from src.api.models import PredictionRequest
+from src.api.validation import BulkValidator, field_constraints
+
+VALID = {"quartos": 2, "tamanho": 50.0, "banheiros": 1}
+
+# Valores que podem chegar em um corpo JSON, válidos ou não
+VALUES = [
+    0,
+    1,
+    3.0,
+    3.5,
+    99,
+    -1,
+    True,
+    None,
+    math.nan,
+    math.inf,
+    1e400,
+    1e20,
+    -1e20,
+    "3",
+    "3.0",
+    "3.5",
+    " 3 ",
+    "+3",
+    "1_0",
+    "1__0",
+    " 1_0",
+    "1_0 ",
+    "3.",
+    "3e0",
+    ".5",
+    "inf",
+    "nan",
+    "a",
+    "",
+    "١",
+    [1],
+    {"a": 1},
+]
+
+
+def _pydantic_errors(house: dict) -> list[tuple]:
+    try:
+        PredictionRequest(**house)
+    except ValidationError as e:
+        return [
+            (error["type"], error["loc"], error["msg"], error.get("ctx"))
+            for error in e.errors(include_url=False)
+        ]
+    return []
+
+
+def _bulk_errors(house: dict) -> list[tuple]:
+    _, errors = BulkValidator().validate(
+        {name: [value] for name, value in house.items()}, loc=()
+    )
+    return [
+        (error["type"], error["loc"][:1], error["msg"], error.get("ctx"))
+        for error in errors
+    ]
+
+
+@pytest.mark.parametrize("field", list(VALID))
+@pytest.mark.parametrize("value", VALUES, ids=repr)
+def test_same_errors_as_pydantic(field, value):
+    house = {**VALID, field: value}
+    assert _bulk_errors(house) == _pydantic_errors(house)
+
+
+def test_valid_batch_returns_features_in_schema_order():
+    features, errors = BulkValidator().validate(
+        {"banheiros": [1, 2], "quartos": [3, 4], "tamanho": [50.5, "80"]}
+    )
+    assert errors == []
+    np.testing.assert_array_equal(features, [[3, 50.5, 1], [4, 80.0, 2]])
+
+
+def test_errors_point_to_field_and_row():
+    _, errors = BulkValidator().validate(
+        {"quartos": [1, 0, 2], "tamanho": [50, 60, -1], "banheiros": [1, 1, 1]}
+    )
+    assert [error["loc"] for error in errors] == [
+        ("body", "quartos", 1),
+        ("body", "tamanho", 2),
+    ]
+
+
+def test_missing_field_and_length_mismatch():
+    _, errors = BulkValidator().validate({"quartos": [1], "tamanho": [50]})
+    assert [(e["type"], e["loc"]) for e in errors] == [
+        ("missing", ("body", "banheiros"))
+    ]
+
+    _, errors = BulkValidator().validate(
+        {"quartos": [1, 2], "tamanho": [50], "banheiros": [1, 2]}
+    )
+    assert [(e["type"], e["loc"]) for e in errors] == [
+        ("value_error", ("body", "tamanho"))
+    ]
+
+
+def test_max_rows():
+    _, errors = BulkValidator(max_rows=2).validate(
+        {"quartos": [1] * 3, "tamanho": [50] * 3, "banheiros": [1] * 3}
+    )
+    assert {error["type"] for error in errors} == {"too_long"}
+
+
+def test_unsupported_schema_is_rejected():
+    class MultipleOf(BaseModel):
+        quartos: int = Field(..., multiple_of=2)
+
+    class Optional(BaseModel):
+        quartos: int | None = None
+
+    class WithValidator(BaseModel):
+        quartos: int
+
+        @field_validator("quartos")
+        @classmethod
+        def check(cls, value):
+            return value
+
+    for model in (MultipleOf, Optional, WithValidator):
+        with pytest.raises(ValueError):
+            field_constraints(model)